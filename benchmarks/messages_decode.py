@@ -0,0 +1,121 @@
+"""Benchmark the decoding of thread histories.
+
+Compares decoding the response into Python objects and then building each
+`Message` from them, which is how histories used to be decoded, with validating
+the raw response bytes at once through `MESSAGES_ADAPTER`, for threads with 100
+and 1000 messages.
+
+Run from the repository root with `python -m benchmarks.messages_decode`.
+"""
+
+import json
+import statistics
+import time
+import uuid
+
+import httpx
+
+from frontend.api.base import MESSAGES_ADAPTER
+from frontend.datatypes import Message
+
+ROUNDS = 7
+
+
+def make_history(messages: int) -> bytes:
+    tool_output = json.dumps(
+        [{"col_a": i, "col_b": "x" * 20, "col_c": i * 1.5} for i in range(300)]
+    )
+    history = []
+
+    for i in range(messages):
+        if i % 2 == 0:
+            history.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "role": "USER",
+                    "content": "pergunta " * 10,
+                    "artifacts": None,
+                    "events": None,
+                    "status": "SUCCESS",
+                }
+            )
+            continue
+
+        events = []
+
+        for k in range(4):
+            events.append(
+                {
+                    "type": "tool_call",
+                    "data": {
+                        "content": "thinking",
+                        "tool_calls": [
+                            {
+                                "id": str(k),
+                                "name": "execute_bigquery_sql",
+                                "args": {"sql_query": "SELECT * FROM t"},
+                            }
+                        ],
+                    },
+                }
+            )
+            events.append(
+                {
+                    "type": "tool_output",
+                    "data": {
+                        "tool_outputs": [
+                            {
+                                "status": "success",
+                                "tool_call_id": str(k),
+                                "tool_name": "execute_bigquery_sql",
+                                "output": tool_output,
+                            }
+                        ]
+                    },
+                }
+            )
+
+        events.append({"type": "final_answer", "data": {"content": "resposta " * 100}})
+        events.append({"type": "complete", "data": {"run_id": str(uuid.uuid4())}})
+
+        history.append(
+            {
+                "id": str(uuid.uuid4()),
+                "role": "ASSISTANT",
+                "content": "resposta " * 100,
+                "artifacts": [],
+                "events": events,
+                "status": "SUCCESS",
+            }
+        )
+
+    return json.dumps(history).encode()
+
+
+def decode_objects(response: httpx.Response) -> list[Message]:
+    return [Message(**message) for message in response.json()]
+
+
+def decode_bytes(response: httpx.Response) -> list[Message]:
+    return MESSAGES_ADAPTER.validate_json(response.content)
+
+
+if __name__ == "__main__":
+    for messages in (100, 1000):
+        body = make_history(messages)
+
+        for name, decode in [
+            ("response.json() + Message(**message)", decode_objects),
+            ("MESSAGES_ADAPTER.validate_json", decode_bytes),
+        ]:
+            times = []
+
+            for _ in range(ROUNDS):
+                response = httpx.Response(200, content=body)
+                start = time.perf_counter()
+                decode(response)
+                times.append(time.perf_counter() - start)
+
+            size = len(body) / 1e6
+            elapsed = statistics.median(times) * 1000
+            print(f"{messages:5d} msgs {size:6.1f} MB  {name:38s} {elapsed:8.1f} ms")
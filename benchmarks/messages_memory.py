@@ -0,0 +1,140 @@
+"""Benchmark the memory held by decoded thread histories.
+
+Reports the bytes per message retained by a history of 1000 messages when its
+events are kept as a list of pydantic models, which is how messages used to be
+decoded, as a `Message` with an `EventLog`, and as a `HistoryMessage`, for
+typical threads and for threads with many tool calls.
+
+Run from the repository root with `python -m benchmarks.messages_memory`.
+"""
+
+import gc
+import json
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+from frontend.api.base import MESSAGES_ADAPTER
+from frontend.datatypes import StreamEvent, to_history
+
+MESSAGES = 1000
+
+
+class PydanticEventsMessage(BaseModel):
+    id: uuid.UUID
+    role: str
+    content: str
+    artifacts: list = []
+    events: list[StreamEvent] = []
+    status: str
+
+
+PYDANTIC_EVENTS_ADAPTER = TypeAdapter(list[PydanticEventsMessage])
+
+
+def make_history(messages: int, tool_calls: int) -> bytes:
+    tool_output = json.dumps([{"col_a": i, "col_b": "x" * 20} for i in range(40)])
+    history = []
+
+    for i in range(messages):
+        if i % 2 == 0:
+            history.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "role": "USER",
+                    "content": "qual a população de São Paulo em 2020?",
+                    "status": "SUCCESS",
+                }
+            )
+            continue
+
+        events = []
+
+        for k in range(tool_calls):
+            events.append(
+                {
+                    "type": "tool_call",
+                    "data": {
+                        "content": "thinking",
+                        "tool_calls": [
+                            {
+                                "id": str(k),
+                                "name": "execute_bigquery_sql",
+                                "args": {"sql_query": "SELECT * FROM t"},
+                            }
+                        ],
+                    },
+                }
+            )
+            events.append(
+                {
+                    "type": "tool_output",
+                    "data": {
+                        "tool_outputs": [
+                            {
+                                "status": "success",
+                                "tool_call_id": str(k),
+                                "tool_name": "execute_bigquery_sql",
+                                "output": tool_output,
+                            }
+                        ]
+                    },
+                }
+            )
+
+        events.append({"type": "final_answer", "data": {"content": "resposta " * 60}})
+        events.append({"type": "complete", "data": {"run_id": str(uuid.uuid4())}})
+
+        history.append(
+            {
+                "id": str(uuid.uuid4()),
+                "role": "ASSISTANT",
+                "content": "resposta " * 60,
+                "events": events,
+                "status": "SUCCESS",
+            }
+        )
+
+    return json.dumps(history).encode()
+
+
+def measure(decode: Callable[[], Any]) -> int:
+    """Get the bytes still allocated by the result of a decoding."""
+    gc.collect()
+    tracemalloc.start()
+    result = decode()  # noqa: F841
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+if __name__ == "__main__":
+    for label, tool_calls in [("typical (no tools)", 0), ("tool-heavy (4 calls)", 4)]:
+        body = make_history(MESSAGES, tool_calls)
+
+        results = [
+            (
+                "pydantic events",
+                measure(lambda body=body: PYDANTIC_EVENTS_ADAPTER.validate_json(body)),
+            ),
+            (
+                "Message + EventLog",
+                measure(lambda body=body: MESSAGES_ADAPTER.validate_json(body)),
+            ),
+            (
+                "HistoryMessage",
+                measure(
+                    lambda body=body: to_history(MESSAGES_ADAPTER.validate_json(body))
+                ),
+            ),
+        ]
+
+        print(
+            f"{label:22s} "
+            + " | ".join(
+                f"{name}: {size / MESSAGES:8.0f} B/msg" for name, size in results
+            )
+        )
@@ -0,0 +1,142 @@
+"""Benchmark the decoding of streamed NDJSON events.
+
+Compares the line-based path, which decodes every line into `str` before
+validating it, with the byte splitter used by the API clients, on streams with
+small tool outputs and with large ones. Also measures how long the first event
+of a slow stream takes to be yielded, with and without a fixed chunk size.
+
+Run from the repository root with `python -m benchmarks.ndjson_stream`.
+"""
+
+import json
+import statistics
+import time
+import uuid
+
+import httpx
+
+from frontend.api.ndjson import iter_stream_events
+from frontend.datatypes import StreamEvent
+
+ROUNDS = 40
+NETWORK_CHUNK_SIZE = 16384
+
+
+def make_payload(large_every: int) -> tuple[bytes, int]:
+    large_output = json.dumps(
+        [{"col_a": i, "col_b": "x" * 20, "col_c": i * 1.5} for i in range(2000)]
+    )
+    events = []
+
+    for i in range(200):
+        events.append(
+            {
+                "type": "tool_call",
+                "data": {
+                    "content": "thinking",
+                    "tool_calls": [
+                        {
+                            "id": "call",
+                            "name": "execute_bigquery_sql",
+                            "args": {"sql_query": "SELECT 1"},
+                        }
+                    ],
+                },
+            }
+        )
+        large = large_every and i % large_every == 0
+        events.append(
+            {
+                "type": "tool_output",
+                "data": {
+                    "tool_outputs": [
+                        {
+                            "status": "success",
+                            "tool_call_id": "call",
+                            "tool_name": "execute_bigquery_sql",
+                            "output": large_output if large else "[1, 2]",
+                            "metadata": {"truncated": False},
+                        }
+                    ]
+                },
+            }
+        )
+
+    events.append({"type": "final_answer", "data": {"content": "answer " * 200}})
+    events.append({"type": "complete", "data": {"run_id": str(uuid.uuid4())}})
+
+    payload = b"".join(json.dumps(event).encode() + b"\n" for event in events)
+    return payload, len(events)
+
+
+class PayloadStream(httpx.SyncByteStream):
+    def __init__(self, payload: bytes):
+        self.payload = payload
+
+    def __iter__(self):
+        for i in range(0, len(self.payload), NETWORK_CHUNK_SIZE):
+            yield self.payload[i : i + NETWORK_CHUNK_SIZE]
+
+
+class SlowStream(httpx.SyncByteStream):
+    """Stream that sends one small event at a time."""
+
+    def __init__(self, lines: list[bytes], delay: float):
+        self.lines = lines
+        self.delay = delay
+
+    def __iter__(self):
+        for line in self.lines:
+            yield line
+            time.sleep(self.delay)
+
+
+def decode_lines(response: httpx.Response) -> list[StreamEvent]:
+    return [
+        StreamEvent.model_validate_json(line) for line in response.iter_lines() if line
+    ]
+
+
+def decode_bytes(response: httpx.Response) -> list[StreamEvent]:
+    return list(iter_stream_events(response.iter_bytes()))
+
+
+def bench_throughput():
+    for label, large_every in [("small outputs", 0), ("large outputs", 10)]:
+        payload, events = make_payload(large_every)
+
+        for name, decode in [
+            ("iter_lines + model_validate_json", decode_lines),
+            ("iter_bytes + byte splitter", decode_bytes),
+        ]:
+            wall_times = []
+            cpu_times = []
+
+            for _ in range(ROUNDS):
+                response = httpx.Response(200, stream=PayloadStream(payload))
+                wall_start = time.perf_counter()
+                cpu_start = time.process_time()
+                decode(response)
+                wall_times.append(time.perf_counter() - wall_start)
+                cpu_times.append(time.process_time() - cpu_start)
+
+            rate = events / statistics.median(wall_times)
+            cpu = statistics.median(cpu_times) / events * 1e6
+            print(f"{label:14s} {name:34s} {rate:9.0f} ev/s {cpu:7.1f} us CPU/ev")
+
+
+def bench_first_event(delay: float = 0.2):
+    line = json.dumps({"type": "tool_call", "data": {"content": "thinking"}}).encode()
+    lines = [line + b"\n"] * 4
+
+    for name, chunk_size in [("iter_bytes(65536)", 65536), ("iter_bytes()", None)]:
+        response = httpx.Response(200, stream=SlowStream(lines, delay))
+        start = time.perf_counter()
+        next(iter_stream_events(response.iter_bytes(chunk_size)))
+        elapsed = time.perf_counter() - start
+        print(f"first event, {delay}s between events, {name:18s} {elapsed:6.3f} s")
+
+
+if __name__ == "__main__":
+    bench_throughput()
+    bench_first_event()
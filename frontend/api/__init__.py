@@ -1,3 +1,11 @@
 from .api_client import APIClient
+from .async_api_client import AsyncAPIClient
+from .token_store import InMemoryTokenStore, StreamlitTokenStore, TokenStore
 
-__all__ = ["APIClient"]
+__all__ = [
+    "APIClient",
+    "AsyncAPIClient",
+    "InMemoryTokenStore",
+    "StreamlitTokenStore",
+    "TokenStore",
+]
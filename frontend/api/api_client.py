@@ -1,91 +1,107 @@
-import uuid
-from datetime import datetime, timedelta
-from typing import Iterator
+import time
+from collections.abc import Iterator
 
 import httpx
-import jwt
-import time
-import streamlit as st
-from loguru import logger
 from pydantic import UUID4
 
-from frontend.datatypes import EventData, Message, StreamEvent, Thread, UserMessage
+from frontend.api.base import (
+    ACCESS_FORBIDDEN_MESSAGE,
+    AUTH_BATCHED_QUERY,
+    AUTH_QUERY,
+    AUTH_REFRESH_BATCHED_QUERY,
+    AUTH_REFRESH_QUERY,
+    DELETE_THREAD_TIMEOUT,
+    INVALID_CREDENTIALS_MESSAGE,
+    LOGIN_ERROR_MESSAGE,
+    LOGIN_SUCCESS_MESSAGE,
+    MESSAGES_ADAPTER,
+    SEND_MESSAGE_TIMEOUT,
+    STREAM_ERROR_MESSAGE,
+    STREAM_TIMEOUT_MESSAGE,
+    THREADS_ADAPTER,
+    VERIFY_TOKEN_QUERY,
+    BaseAPIClient,
+)
+from frontend.api.http import get_http_client
+from frontend.api.ndjson import iter_stream_events
+from frontend.api.threads_cache import threads_cache
+from frontend.api.token_cache import get_user_key, token_cache
+from frontend.api.token_manager import TokenManager
+from frontend.api.token_manager import token_manager as default_token_manager
+from frontend.api.token_store import (
+    InMemoryTokenStore,
+    StreamlitTokenStore,
+    TokenStore,
+)
+from frontend.api.workers import get_worker_pool
+from frontend.datatypes import LoginResult, Message, StreamEvent, Thread, UserMessage
 from frontend.exceptions import AccessForbiddenException, SessionExpiredException
 
-_AUTH_QUERY = """
-mutation getToken($email: String!,  $password: String!) {
-    tokenAuth(email: $email, password: $password) {
-        token
-    }
-}
-"""
-
-_AUTH_REFRESH_QUERY = """
-mutation refreshToken($token: String!) {
-    refreshToken(token: $token) {
-        token
-    }
-}
-"""
-
-_VERIFY_TOKEN_QUERY = """
-mutation verifyToken($token: String!) {
-    verifyToken(token: $token) {
-        payload
-    }
-}
-"""
-
-
-class APIClient:
-    def __init__(self, base_website_url: str, base_chatbot_url: str):
-        self.base_website_url = base_website_url
-        self.base_chatbot_url = base_chatbot_url
-        self.logger = logger.bind(classname=self.__class__.__name__)
-
-    def _is_token_expired(self, token: str) -> bool:
-        """Check if a JWT token is expired or about to expire (within 1 minute).
+
+class APIClient(BaseAPIClient):
+    def __init__(
+        self,
+        base_website_url: str,
+        base_chatbot_url: str,
+        http_client: httpx.Client | None = None,
+        token_manager: TokenManager | None = None,
+        token_store: TokenStore | None = None,
+    ):
+        super().__init__(base_website_url, base_chatbot_url)
+        self.http_client = http_client or get_http_client()
+        self.token_manager = token_manager or default_token_manager
+        self.token_store = token_store or StreamlitTokenStore()
+
+    def _token_mutation(
+        self, field: str, query: str, batched_query: str, variables: dict
+    ) -> str | None:
+        """Send a token mutation, batching the access verification when supported.
 
         Args:
-            token (str): The token.
+            field (str): The mutation field, e.g. "tokenAuth" or "refreshToken".
+            query (str): The mutation selecting only the token.
+            batched_query (str): The mutation also selecting the token payload.
+            variables (dict): The mutation variables.
+
+        Raises:
+            httpx.HTTPStatusError: If the request fails.
 
         Returns:
-            bool: Whether the token is expired or not.
+            str | None: The token, or None if no token was returned.
         """
-        if not token:
-            return True
+        batched = self._auth_batching_supported
 
-        try:
-            payload: dict = jwt.decode(token, options={"verify_signature": False})
-            exp = payload.get("exp")
-            if not exp:
-                return True
-            expiration = datetime.fromtimestamp(exp)
-            return datetime.now() >= expiration - timedelta(seconds=60)
-        except Exception:
-            return True
+        response = self.http_client.post(
+            url=f"{self.base_website_url}/graphql",
+            json={
+                "query": batched_query if batched else query,
+                "variables": variables,
+            },
+        )
+
+        # Checked before the status, as the rejection may come with a 400 response
+        if batched and self._is_auth_batching_unsupported(response):
+            return self._token_mutation(field, query, batched_query, variables)
+
+        response.raise_for_status()
 
-    def _refresh_access_token(self, access_token: str) -> str:
+        return self._read_token(response.json(), field)
+
+    def _refresh_access_token(self, access_token: str) -> str | None:
         """Refresh the access token.
 
         Args:
             access_token (str): The access token.
 
         Returns:
-            str: A refreshed access token.
+            str | None: A refreshed access token, or None if the refresh token expired.
         """
-        response = httpx.post(
-            f"{self.base_website_url}/graphql",
-            json={"query": _AUTH_REFRESH_QUERY, "variables": {"token": access_token}},
+        return self._token_mutation(
+            field="refreshToken",
+            query=AUTH_REFRESH_QUERY,
+            batched_query=AUTH_REFRESH_BATCHED_QUERY,
+            variables={"token": access_token},
         )
-        response.raise_for_status()
-
-        payload = response.json()["data"]["refreshToken"]
-
-        if payload is None:
-            return None
-
-        return payload["token"]
 
     def _verify_token(self, access_token: str) -> bool:
         """Check if a user has chatbot access.
@@ -96,11 +112,22 @@ class APIClient:
         Returns:
             bool: Whether the user has chatbot access or not.
         """
+        has_chatbot_access = token_cache.get_access(access_token)
+
+        if has_chatbot_access is not None:
+            return has_chatbot_access
+
+        has_chatbot_access = self._verify_token_locally(access_token)
+
+        if has_chatbot_access is not None:
+            token_cache.set_access(access_token, has_chatbot_access)
+            return has_chatbot_access
+
         start = time.perf_counter()
-        response = httpx.post(
+        response = self.http_client.post(
             url=f"{self.base_website_url}/graphql",
             json={
-                "query": _VERIFY_TOKEN_QUERY,
+                "query": VERIFY_TOKEN_QUERY,
                 "variables": {"token": access_token},
             },
         )
@@ -109,11 +136,45 @@ class APIClient:
         self.logger.info(f"Token verification elapsed time: {elapsed:.4f}s")
 
         payload = response.json()["data"]["verifyToken"]["payload"]
-        return payload["has_chatbot_access"]
+        has_chatbot_access = payload["has_chatbot_access"]
+        token_cache.set_access(access_token, has_chatbot_access)
+
+        return has_chatbot_access
+
+    def _refresh_and_verify(self, access_token: str) -> str:
+        """Refresh the access token and check that it still grants chatbot access.
+
+        Args:
+            access_token (str): The access token.
+
+        Raises:
+            SessionExpiredException: If refresh token is None.
+            AccessForbiddenException: If the user does not have chatbot access.
+
+        Returns:
+            str: A refreshed access token.
+        """
+        self.logger.info("[AUTH] Refreshing access token...")
+        access_token = self._refresh_access_token(access_token)
+
+        if access_token is None:
+            self.logger.info("[AUTH] Refresh token expired")
+            raise SessionExpiredException
+
+        if not self._verify_token(access_token):
+            self.logger.info("[AUTH] Access forbidden")
+            raise AccessForbiddenException
+
+        self.logger.success("[AUTH] Access token refreshed successfully")
+        return access_token
 
     def _get_headers(self, access_token: str) -> dict[str, str]:
         """Get authorization headers, refreshing access token as needed.
 
+        Tokens close to expiring are refreshed in the background by the token
+        manager, so this only waits for a refresh if the token is already expired.
+        A token refreshed for this session is published back to the token store.
+
         Args:
             access_token (str): The access token.
 
@@ -124,88 +185,149 @@ class APIClient:
         Returns:
             dict[str, str]: The authorization headers,
         """
-        if self._is_token_expired(access_token):
-            self.logger.info("[AUTH] Access token expired, refreshing...")
-            access_token = self._refresh_access_token(access_token)
+        token = self.token_manager.get_token(access_token, self._refresh_and_verify)
 
-            if access_token is not None:
-                if not self._verify_token(access_token):
-                    self.logger.info("[AUTH] Access forbidden")
-                    raise AccessForbiddenException
-                st.session_state["access_token"] = access_token
-                self.logger.success("[AUTH] Access token refreshed successfully")
-            else:
-                self.logger.info("[AUTH] Refresh token expired")
-                raise SessionExpiredException
+        if token != access_token:
+            self.token_store.set(token)
 
-        return {"Authorization": f"Bearer {access_token}"}
+        return {"Authorization": f"Bearer {token}"}
 
-    @staticmethod
-    def _raise_for_status(response: httpx.Response):
-        """Raise for HTTP errors, converting 403 into AccessForbiddenException.
+    def _request_token(self, email: str, password: str) -> str | None:
+        """Request an access token for the given credentials.
 
         Args:
-            response (httpx.Response): The HTTP response.
+            email (str): The email.
+            password (str): The password.
 
         Raises:
-            AccessForbiddenException: If the response status code is 403 (Forbidden).
-            httpx.HTTPStatusError: If the response status code indicates any other error.
+            httpx.HTTPStatusError: If the credentials are invalid or the request fails.
+
+        Returns:
+            str | None: The access token, or None if no token was returned.
         """
-        if response.status_code == httpx.codes.FORBIDDEN:
-            raise AccessForbiddenException
-        response.raise_for_status()
+        return self._token_mutation(
+            field="tokenAuth",
+            query=AUTH_QUERY,
+            batched_query=AUTH_BATCHED_QUERY,
+            variables={"email": email, "password": password},
+        )
 
-    def authenticate(self, email: str, password: str) -> tuple[str | None, str]:
-        """Send a post request to the authentication endpoint.
+    def _get_threads_timed(
+        self, access_token: str
+    ) -> tuple[list[Thread] | None, float]:
+        """Get the user's threads, measuring how long it took.
+
+        Args:
+            access_token (str): User access token.
+
+        Returns:
+            tuple[list[Thread] | None, float]: The threads and the elapsed time in seconds.
+        """
+        start = time.perf_counter()
+        threads = self.get_threads(access_token)
+        return threads, time.perf_counter() - start
+
+    def login(
+        self, email: str, password: str, fetch_threads: bool = True
+    ) -> LoginResult:
+        """Authenticate a user and, optionally, retrieve their threads.
+
+        Once the access token is obtained, the threads are retrieved on a worker thread
+        while the chatbot access is verified, and discarded if the access is denied.
 
         Args:
             email (str): The email.
             password (str): The password.
+            fetch_threads (bool, optional): Whether to retrieve the user's threads.
+                Defaults to True.
+
+        Raises:
+            SessionExpiredException: If the session expires while retrieving the threads.
 
         Returns:
-            tuple[str|None, str]:
-                A tuple containing the access token and a status message.
+            LoginResult: The access token, a status message, the threads and
+                the elapsed time of each login stage.
         """
+        start = time.perf_counter()
+        timings = {}
         access_token = None
-        message = "Ops! Ocorreu um erro durante o login. Por favor, tente novamente."
+        threads = None
+        threads_future = None
+        message = LOGIN_ERROR_MESSAGE
 
         try:
-            response = httpx.post(
-                url=f"{self.base_website_url}/graphql",
-                json={
-                    "query": _AUTH_QUERY,
-                    "variables": {"email": email, "password": password},
-                },
-            )
-            response.raise_for_status()
-
-            access_token = (
-                response.json().get("data", {}).get("tokenAuth", {}).get("token")
-            )
+            access_token = self._request_token(email, password)
+            timings["token_auth"] = time.perf_counter() - start
 
             if access_token:
-                if not self._verify_token(access_token):
+                if fetch_threads:
+                    client = self.with_token_store(InMemoryTokenStore(access_token))
+                    threads_future = get_worker_pool().submit(
+                        client._get_threads_timed, access_token
+                    )
+
+                verify_start = time.perf_counter()
+                has_chatbot_access = self._verify_token(access_token)
+                timings["verify_token"] = time.perf_counter() - verify_start
+
+                if not has_chatbot_access:
                     raise AccessForbiddenException
+
+                if threads_future is not None:
+                    threads, timings["get_threads"] = threads_future.result()
+
                 self.logger.success("[AUTH] Successfully logged in")
-                message = "Conectado com sucesso!"
+                message = LOGIN_SUCCESS_MESSAGE
             else:
                 self.logger.error("[AUTH] No access token returned")
-        except httpx.HTTPStatusError:
+        except httpx.HTTPStatusError as e:
             access_token = None
-            if response.status_code == httpx.codes.UNAUTHORIZED:
+            if e.response.status_code == httpx.codes.UNAUTHORIZED:
                 self.logger.info("[AUTH] Invalid credentials")
-                message = "Usuário ou senha incorretos."
+                message = INVALID_CREDENTIALS_MESSAGE
             else:
                 self.logger.exception("[AUTH] HTTP error:")
         except AccessForbiddenException:
             access_token = None
-            message = "Você não possui acesso ao chatbot. Para mais informações, contate um administrador."
+            message = ACCESS_FORBIDDEN_MESSAGE
             self.logger.info("[AUTH] Access forbidden")
+        except SessionExpiredException:
+            raise
         except Exception:
             access_token = None
             self.logger.exception("[AUTH] Login error:")
+        finally:
+            # Discard the threads listing if the login did not succeed
+            if access_token is None and threads_future is not None:
+                threads_future.cancel()
+
+        timings["total"] = time.perf_counter() - start
+
+        self.logger.info(
+            "[AUTH] Login timings: "
+            + ", ".join(f"{stage}={elapsed:.4f}s" for stage, elapsed in timings.items())
+        )
+
+        return LoginResult(
+            access_token=access_token,
+            message=message,
+            threads=threads if access_token else None,
+            timings=timings,
+        )
+
+    def authenticate(self, email: str, password: str) -> tuple[str | None, str]:
+        """Send a post request to the authentication endpoint.
+
+        Args:
+            email (str): The email.
+            password (str): The password.
 
-        return access_token, message
+        Returns:
+            tuple[str|None, str]:
+                A tuple containing the access token and a status message.
+        """
+        result = self.login(email, password, fetch_threads=False)
+        return result.access_token, result.message
 
     def create_thread(self, access_token: str, title: str) -> Thread | None:
         """Create a thread.
@@ -220,13 +342,13 @@ class APIClient:
         self.logger.info("[THREAD] Creating thread")
 
         try:
-            response = httpx.post(
+            response = self.http_client.post(
                 url=f"{self.base_chatbot_url}/api/v1/chatbot/threads",
                 json={"title": title},
                 headers=self._get_headers(access_token),
             )
             self._raise_for_status(response)
-            thread = Thread(**response.json())
+            thread = Thread.model_validate_json(response.content)
             self.logger.success(
                 f"[THREAD] Thread created successfully for user {thread.user_id}"
             )
@@ -248,13 +370,27 @@ class APIClient:
         """
         self.logger.info("[THREAD] Retrieving threads")
         try:
-            response = httpx.get(
+            user_key = get_user_key(access_token)
+
+            response = self.http_client.get(
                 url=f"{self.base_chatbot_url}/api/v1/chatbot/threads",
                 params={"order_by": "created_at"},
-                headers=self._get_headers(access_token),
+                headers={
+                    **self._get_headers(access_token),
+                    **threads_cache.get_conditional_headers(user_key),
+                },
             )
+
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                threads = threads_cache.get_not_modified(user_key)
+                if threads is not None:
+                    self.logger.success("[THREAD] Threads not modified, using cache")
+                    return threads
+                raise ValueError("Threads not modified, but no listing is cached")
+
             self._raise_for_status(response)
-            threads = [Thread(**thread) for thread in response.json()]
+            threads = THREADS_ADAPTER.validate_json(response.content)
+            threads_cache.put(user_key, response, threads)
             self.logger.success("[THREAD] Threads retrieved successfully")
             return threads
         except (SessionExpiredException, AccessForbiddenException):
@@ -263,27 +399,53 @@ class APIClient:
             self.logger.exception("[THREAD] Error on threads retrieval:")
             return None
 
-    def get_messages(self, access_token: str, thread_id: UUID4) -> list[Message] | None:
-        """Get all messages from a thread.
+    def get_messages(
+        self, access_token: str, thread_id: UUID4, after: UUID4 | None = None
+    ) -> list[Message] | None:
+        """Get the messages from a thread.
+
+        If a cursor is given, only the messages created after it are requested. As the
+        chatbot API may not support the cursor, the result can still be the whole thread
+        and must be merged into the known messages by id.
 
         Args:
             access_token (str): User access token.
             thread_id (UUID4): Thread unique identifier.
+            after (UUID4 | None, optional): The cursor, i.e. the id of the last known
+                message. Defaults to None, in which case all messages are requested.
 
         Returns:
             list[Message]|None: A list of Message objects if any message was found. None otherwise.
         """
-        self.logger.info(f"[MESSAGE] Retrieving messages for thread {thread_id}")
+        if not self._messages_cursor_supported:
+            after = None
+
+        self.logger.info(
+            f"[MESSAGE] Retrieving messages for thread {thread_id}"
+            + (f" after message {after}" if after is not None else "")
+        )
         try:
-            response = httpx.get(
-                url=f"{self.base_chatbot_url}/api/v1/chatbot/threads/{thread_id}/messages",
-                params={"order_by": "created_at"},
-                headers=self._get_headers(access_token),
+            url = f"{self.base_chatbot_url}/api/v1/chatbot/threads/{thread_id}/messages"
+            headers = self._get_headers(access_token)
+
+            response = self.http_client.get(
+                url=url, params=self._get_messages_params(after), headers=headers
             )
+
+            if after is not None and self._is_cursor_rejected(response):
+                after = None
+                response = self.http_client.get(
+                    url=url, params=self._get_messages_params(None), headers=headers
+                )
+
             self._raise_for_status(response)
-            messages = [Message(**msg) for msg in response.json()]
+            messages = MESSAGES_ADAPTER.validate_json(response.content)
+
+            if after is not None:
+                self._is_cursor_ignored(messages, after)
+
             self.logger.success(
-                f"[MESSAGE] Messages retrieved successfully for thread {thread_id}"
+                f"[MESSAGE] {len(messages)} messages retrieved successfully for thread {thread_id}"
             )
             return messages
         except (SessionExpiredException, AccessForbiddenException):
@@ -317,23 +479,20 @@ class APIClient:
         stream_completed = False
 
         try:
-            with httpx.stream(
+            with self.http_client.stream(
                 method="POST",
                 url=f"{self.base_chatbot_url}/api/v1/chatbot/threads/{thread_id}/messages",
                 headers=self._get_headers(access_token),
                 json=user_message.model_dump(mode="json"),
-                timeout=httpx.Timeout(5.0, read=300.0),
+                timeout=SEND_MESSAGE_TIMEOUT,
             ) as response:
                 self._raise_for_status(response)
 
                 self.logger.success("[MESSAGE] User message sent successfully")
 
-                for line in response.iter_lines():
-                    if not line:
-                        continue
-
-                    event = StreamEvent.model_validate_json(line)
-
+                # Chunks are split as they arrive, as a fixed chunk size would
+                # hold small events back until enough bytes are received
+                for event in iter_stream_events(response.iter_bytes()):
                     if event.type == "complete":
                         stream_completed = True
 
@@ -342,34 +501,15 @@ class APIClient:
             raise
         except httpx.ReadTimeout:
             self.logger.exception("[MESSAGE] Timeout error on sending user message:")
-            error_message = (
-                "Ops, parece que a solicitação expirou! Por favor, tente novamente. "
-                "Se o problema persistir, avise-nos. Obrigado pela paciência!"
-            )
+            error_message = STREAM_TIMEOUT_MESSAGE
         except Exception:
             self.logger.exception("[MESSAGE] Error on sending user message:")
-            error_message = (
-                "Ops, algo deu errado! Por favor, tente novamente. "
-                "Se o problema persistir, avise-nos. Obrigado pela paciência!"
-            )
+            error_message = STREAM_ERROR_MESSAGE
 
         # Safeguard for unexpected stream termination. Handles cases where the server
-        # crashes and the httpx.stream() call ends silently without raising an exception.
+        # crashes and the http_client.stream() call ends silently without raising an exception.
         if not stream_completed:
-            if not error_message:
-                self.logger.error(
-                    "[MESSAGE] Stream terminated without a 'complete' status"
-                )
-                error_message = (
-                    "Ops, a conexão com o servidor foi interrompida inesperadamente! "
-                    "Por favor, tente novamente mais tarde. Se o problema persistir, avise-nos."
-                )
-
-            yield StreamEvent(
-                type="error", data=EventData(error_details={"message": error_message})
-            )
-
-            yield StreamEvent(type="complete", data=EventData(run_id=uuid.uuid4()))
+            yield from self._stream_fallback_events(error_message)
 
     def send_feedback(
         self, access_token: str, message_id: UUID4, rating: int, comments: str
@@ -390,7 +530,7 @@ class APIClient:
         )
 
         try:
-            response = httpx.put(
+            response = self.http_client.put(
                 url=f"{self.base_chatbot_url}/api/v1/chatbot/messages/{message_id}/feedback",
                 json={"rating": rating, "comments": comments},
                 headers=self._get_headers(access_token),
@@ -417,10 +557,10 @@ class APIClient:
         self.logger.info("""[CLEAR] Clearing assistant memory""")
 
         try:
-            response = httpx.delete(
+            response = self.http_client.delete(
                 url=f"{self.base_chatbot_url}/api/v1/chatbot/threads/{thread_id}",
                 headers=self._get_headers(access_token),
-                timeout=httpx.Timeout(5.0, read=60.0),
+                timeout=DELETE_THREAD_TIMEOUT,
             )
             self._raise_for_status(response)
             self.logger.success("[CLEAR] Assistant memory cleared successfully")
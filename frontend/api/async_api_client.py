@@ -0,0 +1,593 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from typing import Self
+
+import httpx
+from pydantic import UUID4
+
+from frontend.api.base import (
+    ACCESS_FORBIDDEN_MESSAGE,
+    AUTH_BATCHED_QUERY,
+    AUTH_QUERY,
+    AUTH_REFRESH_BATCHED_QUERY,
+    AUTH_REFRESH_QUERY,
+    DELETE_THREAD_TIMEOUT,
+    INVALID_CREDENTIALS_MESSAGE,
+    LOGIN_ERROR_MESSAGE,
+    LOGIN_SUCCESS_MESSAGE,
+    MESSAGES_ADAPTER,
+    SEND_MESSAGE_TIMEOUT,
+    STREAM_ERROR_MESSAGE,
+    STREAM_TIMEOUT_MESSAGE,
+    THREADS_ADAPTER,
+    VERIFY_TOKEN_QUERY,
+    BaseAPIClient,
+)
+from frontend.api.http import create_async_http_client
+from frontend.api.ndjson import aiter_stream_events
+from frontend.api.threads_cache import threads_cache
+from frontend.api.token_cache import get_user_key, token_cache
+from frontend.api.token_manager import TokenManager
+from frontend.api.token_manager import token_manager as default_token_manager
+from frontend.api.token_store import (
+    InMemoryTokenStore,
+    StreamlitTokenStore,
+    TokenStore,
+)
+from frontend.datatypes import LoginResult, Message, StreamEvent, Thread, UserMessage
+from frontend.exceptions import AccessForbiddenException, SessionExpiredException
+
+
+class AsyncAPIClient(BaseAPIClient):
+    """Asyncio counterpart of `APIClient`, exposing the same methods as coroutines.
+
+    The underlying `httpx.AsyncClient` is bound to the event loop it is first used
+    in, so an instance should not be shared across event loops. Use it as an async
+    context manager or call `aclose()` to release its connections.
+    """
+
+    def __init__(
+        self,
+        base_website_url: str,
+        base_chatbot_url: str,
+        http_client: httpx.AsyncClient | None = None,
+        token_manager: TokenManager | None = None,
+        token_store: TokenStore | None = None,
+    ):
+        super().__init__(base_website_url, base_chatbot_url)
+        self.http_client = http_client or create_async_http_client()
+        self.token_manager = token_manager or default_token_manager
+        self.token_store = token_store or StreamlitTokenStore()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying HTTP client."""
+        await self.http_client.aclose()
+
+    async def _token_mutation(
+        self, field: str, query: str, batched_query: str, variables: dict
+    ) -> str | None:
+        """Send a token mutation, batching the access verification when supported.
+
+        Args:
+            field (str): The mutation field, e.g. "tokenAuth" or "refreshToken".
+            query (str): The mutation selecting only the token.
+            batched_query (str): The mutation also selecting the token payload.
+            variables (dict): The mutation variables.
+
+        Raises:
+            httpx.HTTPStatusError: If the request fails.
+
+        Returns:
+            str | None: The token, or None if no token was returned.
+        """
+        batched = self._auth_batching_supported
+
+        response = await self.http_client.post(
+            url=f"{self.base_website_url}/graphql",
+            json={
+                "query": batched_query if batched else query,
+                "variables": variables,
+            },
+        )
+
+        # Checked before the status, as the rejection may come with a 400 response
+        if batched and self._is_auth_batching_unsupported(response):
+            return await self._token_mutation(field, query, batched_query, variables)
+
+        response.raise_for_status()
+
+        return self._read_token(response.json(), field)
+
+    async def _refresh_access_token(self, access_token: str) -> str | None:
+        """Refresh the access token.
+
+        Args:
+            access_token (str): The access token.
+
+        Returns:
+            str | None: A refreshed access token, or None if the refresh token expired.
+        """
+        return await self._token_mutation(
+            field="refreshToken",
+            query=AUTH_REFRESH_QUERY,
+            batched_query=AUTH_REFRESH_BATCHED_QUERY,
+            variables={"token": access_token},
+        )
+
+    async def _verify_token(self, access_token: str) -> bool:
+        """Check if a user has chatbot access.
+
+        Args:
+            access_token (str): The user's access token.
+
+        Returns:
+            bool: Whether the user has chatbot access or not.
+        """
+        has_chatbot_access = token_cache.get_access(access_token)
+
+        if has_chatbot_access is not None:
+            return has_chatbot_access
+
+        has_chatbot_access = self._verify_token_locally(access_token)
+
+        if has_chatbot_access is not None:
+            token_cache.set_access(access_token, has_chatbot_access)
+            return has_chatbot_access
+
+        start = time.perf_counter()
+        response = await self.http_client.post(
+            url=f"{self.base_website_url}/graphql",
+            json={
+                "query": VERIFY_TOKEN_QUERY,
+                "variables": {"token": access_token},
+            },
+        )
+        response.raise_for_status()
+        elapsed = time.perf_counter() - start
+        self.logger.info(f"Token verification elapsed time: {elapsed:.4f}s")
+
+        payload = response.json()["data"]["verifyToken"]["payload"]
+        has_chatbot_access = payload["has_chatbot_access"]
+        token_cache.set_access(access_token, has_chatbot_access)
+
+        return has_chatbot_access
+
+    async def _refresh_and_verify(self, access_token: str) -> str:
+        """Refresh the access token and check that it still grants chatbot access.
+
+        Args:
+            access_token (str): The access token.
+
+        Raises:
+            SessionExpiredException: If refresh token is None.
+            AccessForbiddenException: If the user does not have chatbot access.
+
+        Returns:
+            str: A refreshed access token.
+        """
+        self.logger.info("[AUTH] Refreshing access token...")
+        access_token = await self._refresh_access_token(access_token)
+
+        if access_token is None:
+            self.logger.info("[AUTH] Refresh token expired")
+            raise SessionExpiredException
+
+        if not await self._verify_token(access_token):
+            self.logger.info("[AUTH] Access forbidden")
+            raise AccessForbiddenException
+
+        self.logger.success("[AUTH] Access token refreshed successfully")
+        return access_token
+
+    async def _get_headers(self, access_token: str) -> dict[str, str]:
+        """Get authorization headers, refreshing access token as needed.
+
+        Tokens close to expiring are refreshed in the background by the token
+        manager, so this only waits for a refresh if the token is already expired.
+        A token refreshed for this session is published back to the token store.
+
+        Args:
+            access_token (str): The access token.
+
+        Raises:
+            SessionExpiredException: If refresh token is None.
+            AccessForbiddenException: If the user does not have chatbot access.
+
+        Returns:
+            dict[str, str]: The authorization headers,
+        """
+        token = await self.token_manager.aget_token(
+            access_token, self._refresh_and_verify
+        )
+
+        if token != access_token:
+            self.token_store.set(token)
+
+        return {"Authorization": f"Bearer {token}"}
+
+    async def _request_token(self, email: str, password: str) -> str | None:
+        """Request an access token for the given credentials.
+
+        Args:
+            email (str): The email.
+            password (str): The password.
+
+        Raises:
+            httpx.HTTPStatusError: If the credentials are invalid or the request fails.
+
+        Returns:
+            str | None: The access token, or None if no token was returned.
+        """
+        return await self._token_mutation(
+            field="tokenAuth",
+            query=AUTH_QUERY,
+            batched_query=AUTH_BATCHED_QUERY,
+            variables={"email": email, "password": password},
+        )
+
+    async def _get_threads_timed(
+        self, access_token: str
+    ) -> tuple[list[Thread] | None, float]:
+        """Get the user's threads, measuring how long it took.
+
+        Args:
+            access_token (str): User access token.
+
+        Returns:
+            tuple[list[Thread] | None, float]: The threads and the elapsed time in seconds.
+        """
+        start = time.perf_counter()
+        threads = await self.get_threads(access_token)
+        return threads, time.perf_counter() - start
+
+    async def login(
+        self, email: str, password: str, fetch_threads: bool = True
+    ) -> LoginResult:
+        """Authenticate a user and, optionally, retrieve their threads.
+
+        Once the access token is obtained, the threads are retrieved in a separate task
+        while the chatbot access is verified, and discarded if the access is denied.
+
+        Args:
+            email (str): The email.
+            password (str): The password.
+            fetch_threads (bool, optional): Whether to retrieve the user's threads.
+                Defaults to True.
+
+        Raises:
+            SessionExpiredException: If the session expires while retrieving the threads.
+
+        Returns:
+            LoginResult: The access token, a status message, the threads and
+                the elapsed time of each login stage.
+        """
+        start = time.perf_counter()
+        timings = {}
+        access_token = None
+        threads = None
+        threads_task = None
+        message = LOGIN_ERROR_MESSAGE
+
+        try:
+            access_token = await self._request_token(email, password)
+            timings["token_auth"] = time.perf_counter() - start
+
+            if access_token:
+                if fetch_threads:
+                    client = self.with_token_store(InMemoryTokenStore(access_token))
+                    threads_task = asyncio.create_task(
+                        client._get_threads_timed(access_token)
+                    )
+
+                verify_start = time.perf_counter()
+                has_chatbot_access = await self._verify_token(access_token)
+                timings["verify_token"] = time.perf_counter() - verify_start
+
+                if not has_chatbot_access:
+                    raise AccessForbiddenException
+
+                if threads_task is not None:
+                    threads, timings["get_threads"] = await threads_task
+
+                self.logger.success("[AUTH] Successfully logged in")
+                message = LOGIN_SUCCESS_MESSAGE
+            else:
+                self.logger.error("[AUTH] No access token returned")
+        except httpx.HTTPStatusError as e:
+            access_token = None
+            if e.response.status_code == httpx.codes.UNAUTHORIZED:
+                self.logger.info("[AUTH] Invalid credentials")
+                message = INVALID_CREDENTIALS_MESSAGE
+            else:
+                self.logger.exception("[AUTH] HTTP error:")
+        except AccessForbiddenException:
+            access_token = None
+            message = ACCESS_FORBIDDEN_MESSAGE
+            self.logger.info("[AUTH] Access forbidden")
+        except SessionExpiredException:
+            raise
+        except Exception:
+            access_token = None
+            self.logger.exception("[AUTH] Login error:")
+        finally:
+            # Discard the threads listing if the login did not succeed
+            if access_token is None and threads_task is not None:
+                threads_task.cancel()
+
+        timings["total"] = time.perf_counter() - start
+
+        self.logger.info(
+            "[AUTH] Login timings: "
+            + ", ".join(f"{stage}={elapsed:.4f}s" for stage, elapsed in timings.items())
+        )
+
+        return LoginResult(
+            access_token=access_token,
+            message=message,
+            threads=threads if access_token else None,
+            timings=timings,
+        )
+
+    async def authenticate(self, email: str, password: str) -> tuple[str | None, str]:
+        """Send a post request to the authentication endpoint.
+
+        Args:
+            email (str): The email.
+            password (str): The password.
+
+        Returns:
+            tuple[str|None, str]:
+                A tuple containing the access token and a status message.
+        """
+        result = await self.login(email, password, fetch_threads=False)
+        return result.access_token, result.message
+
+    async def create_thread(self, access_token: str, title: str) -> Thread | None:
+        """Create a thread.
+
+        Args:
+            access_token (str): User access token.
+            title (str): The thread title.
+
+        Returns:
+            Thread|None: A Thread object if the thread was created successfully. None otherwise.
+        """
+        self.logger.info("[THREAD] Creating thread")
+
+        try:
+            response = await self.http_client.post(
+                url=f"{self.base_chatbot_url}/api/v1/chatbot/threads",
+                json={"title": title},
+                headers=await self._get_headers(access_token),
+            )
+            self._raise_for_status(response)
+            thread = Thread.model_validate_json(response.content)
+            self.logger.success(
+                f"[THREAD] Thread created successfully for user {thread.user_id}"
+            )
+            return thread
+        except (SessionExpiredException, AccessForbiddenException):
+            raise
+        except Exception:
+            self.logger.exception("[THREAD] Error on thread creation:")
+            return None
+
+    async def get_threads(self, access_token: str) -> list[Thread] | None:
+        """Get all threads from a user.
+
+        Args:
+            access_token (str): User access token.
+
+        Returns:
+            list[Thread]|None: A list of Thread objects if any thread was found. None otherwise.
+        """
+        self.logger.info("[THREAD] Retrieving threads")
+        try:
+            user_key = get_user_key(access_token)
+
+            response = await self.http_client.get(
+                url=f"{self.base_chatbot_url}/api/v1/chatbot/threads",
+                params={"order_by": "created_at"},
+                headers={
+                    **await self._get_headers(access_token),
+                    **threads_cache.get_conditional_headers(user_key),
+                },
+            )
+
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                threads = threads_cache.get_not_modified(user_key)
+                if threads is not None:
+                    self.logger.success("[THREAD] Threads not modified, using cache")
+                    return threads
+                raise ValueError("Threads not modified, but no listing is cached")
+
+            self._raise_for_status(response)
+            threads = THREADS_ADAPTER.validate_json(response.content)
+            threads_cache.put(user_key, response, threads)
+            self.logger.success("[THREAD] Threads retrieved successfully")
+            return threads
+        except (SessionExpiredException, AccessForbiddenException):
+            raise
+        except Exception:
+            self.logger.exception("[THREAD] Error on threads retrieval:")
+            return None
+
+    async def get_messages(
+        self, access_token: str, thread_id: UUID4, after: UUID4 | None = None
+    ) -> list[Message] | None:
+        """Get the messages from a thread.
+
+        If a cursor is given, only the messages created after it are requested. As the
+        chatbot API may not support the cursor, the result can still be the whole thread
+        and must be merged into the known messages by id.
+
+        Args:
+            access_token (str): User access token.
+            thread_id (UUID4): Thread unique identifier.
+            after (UUID4 | None, optional): The cursor, i.e. the id of the last known
+                message. Defaults to None, in which case all messages are requested.
+
+        Returns:
+            list[Message]|None: A list of Message objects if any message was found. None otherwise.
+        """
+        if not self._messages_cursor_supported:
+            after = None
+
+        self.logger.info(
+            f"[MESSAGE] Retrieving messages for thread {thread_id}"
+            + (f" after message {after}" if after is not None else "")
+        )
+        try:
+            url = f"{self.base_chatbot_url}/api/v1/chatbot/threads/{thread_id}/messages"
+            headers = await self._get_headers(access_token)
+
+            response = await self.http_client.get(
+                url=url, params=self._get_messages_params(after), headers=headers
+            )
+
+            if after is not None and self._is_cursor_rejected(response):
+                after = None
+                response = await self.http_client.get(
+                    url=url, params=self._get_messages_params(None), headers=headers
+                )
+
+            self._raise_for_status(response)
+            messages = MESSAGES_ADAPTER.validate_json(response.content)
+
+            if after is not None:
+                self._is_cursor_ignored(messages, after)
+
+            self.logger.success(
+                f"[MESSAGE] {len(messages)} messages retrieved successfully for thread {thread_id}"
+            )
+            return messages
+        except (SessionExpiredException, AccessForbiddenException):
+            raise
+        except Exception:
+            self.logger.exception(
+                f"[MESSAGE] Error on messages retrieval for thread {thread_id}:"
+            )
+            return None
+
+    async def send_message(
+        self, access_token: str, message: str, thread_id: UUID4
+    ) -> AsyncIterator[StreamEvent]:
+        """Send a user message and stream the assistant's response.
+
+        Args:
+            access_token (str): User access token.
+            message (str): The message sent by the user.
+            thread_id (UUID4):Thread unique identifier.
+
+        Yields:
+            AsyncIterator[StreamEvent]: Async iterator of `StreamEvent` objects.
+        """
+        user_message = UserMessage(content=message)
+
+        self.logger.info(
+            f"[MESSAGE] Sending message {user_message.id} in thread {thread_id}"
+        )
+
+        error_message = None
+        stream_completed = False
+
+        try:
+            async with self.http_client.stream(
+                method="POST",
+                url=f"{self.base_chatbot_url}/api/v1/chatbot/threads/{thread_id}/messages",
+                headers=await self._get_headers(access_token),
+                json=user_message.model_dump(mode="json"),
+                timeout=SEND_MESSAGE_TIMEOUT,
+            ) as response:
+                self._raise_for_status(response)
+
+                self.logger.success("[MESSAGE] User message sent successfully")
+
+                # Chunks are split as they arrive, as a fixed chunk size would
+                # hold small events back until enough bytes are received
+                async for event in aiter_stream_events(response.aiter_bytes()):
+                    if event.type == "complete":
+                        stream_completed = True
+
+                    yield event
+        except (SessionExpiredException, AccessForbiddenException):
+            raise
+        except httpx.ReadTimeout:
+            self.logger.exception("[MESSAGE] Timeout error on sending user message:")
+            error_message = STREAM_TIMEOUT_MESSAGE
+        except Exception:
+            self.logger.exception("[MESSAGE] Error on sending user message:")
+            error_message = STREAM_ERROR_MESSAGE
+
+        # Safeguard for unexpected stream termination. Handles cases where the server
+        # crashes and the http_client.stream() call ends silently without raising an exception.
+        if not stream_completed:
+            for event in self._stream_fallback_events(error_message):
+                yield event
+
+    async def send_feedback(
+        self, access_token: str, message_id: UUID4, rating: int, comments: str
+    ) -> bool:
+        """Send a feedback.
+
+        Args:
+            access_token (str): User access token.
+            message_id (UUID4): The message unique identifier.
+            rating (int): The rating (0 or 1).
+            comments (str): The comments.
+
+        Returns:
+            bool: Whether the operation succeeded or not.
+        """
+        self.logger.info(
+            f"[FEEDBACK] Sending feedback ({rating}) for message pair {message_id}"
+        )
+
+        try:
+            response = await self.http_client.put(
+                url=f"{self.base_chatbot_url}/api/v1/chatbot/messages/{message_id}/feedback",
+                json={"rating": rating, "comments": comments},
+                headers=await self._get_headers(access_token),
+            )
+            self._raise_for_status(response)
+            self.logger.success("[FEEDBACK] Feedback sent successfully")
+            return True
+        except (SessionExpiredException, AccessForbiddenException):
+            raise
+        except Exception:
+            self.logger.exception("[FEEDBACK] Error on sending feedback:")
+            return False
+
+    async def delete_thread(self, access_token: str, thread_id: UUID4) -> bool:
+        """Soft delete a thread and hard delete all its checkpoints.
+
+        Args:
+            access_token (str): User access token.
+            thread_id (UUID4): Thread unique identifier.
+
+        Returns:
+            bool: Whether the operation succeeded or not.
+        """
+        self.logger.info("""[CLEAR] Clearing assistant memory""")
+
+        try:
+            response = await self.http_client.delete(
+                url=f"{self.base_chatbot_url}/api/v1/chatbot/threads/{thread_id}",
+                headers=await self._get_headers(access_token),
+                timeout=DELETE_THREAD_TIMEOUT,
+            )
+            self._raise_for_status(response)
+            self.logger.success("[CLEAR] Assistant memory cleared successfully")
+            return True
+        except (SessionExpiredException, AccessForbiddenException):
+            raise
+        except Exception:
+            self.logger.exception("[CLEAR] Error on clearing assistant memory:")
+            return False
@@ -0,0 +1,334 @@
+import copy
+import re
+import uuid
+
+import httpx
+import jwt
+from loguru import logger
+from pydantic import TypeAdapter
+
+from frontend.api.token_cache import token_cache
+from frontend.api.token_store import TokenStore
+from frontend.datatypes import EventData, Message, StreamEvent, Thread
+from frontend.exceptions import AccessForbiddenException
+from frontend.settings import settings
+
+AUTH_QUERY = """
+mutation getToken($email: String!,  $password: String!) {
+    tokenAuth(email: $email, password: $password) {
+        token
+    }
+}
+"""
+
+AUTH_REFRESH_QUERY = """
+mutation refreshToken($token: String!) {
+    refreshToken(token: $token) {
+        token
+    }
+}
+"""
+
+# Variants of the token mutations that also select the token payload, so the
+# chatbot access is verified in the same request that obtains the token
+AUTH_BATCHED_QUERY = """
+mutation getToken($email: String!,  $password: String!) {
+    tokenAuth(email: $email, password: $password) {
+        token
+        payload
+    }
+}
+"""
+
+AUTH_REFRESH_BATCHED_QUERY = """
+mutation refreshToken($token: String!) {
+    refreshToken(token: $token) {
+        token
+        payload
+    }
+}
+"""
+
+VERIFY_TOKEN_QUERY = """
+mutation verifyToken($token: String!) {
+    verifyToken(token: $token) {
+        payload
+    }
+}
+"""
+
+LOGIN_ERROR_MESSAGE = (
+    "Ops! Ocorreu um erro durante o login. Por favor, tente novamente."
+)
+LOGIN_SUCCESS_MESSAGE = "Conectado com sucesso!"
+INVALID_CREDENTIALS_MESSAGE = "Usuário ou senha incorretos."
+ACCESS_FORBIDDEN_MESSAGE = (
+    "Você não possui acesso ao chatbot. "
+    "Para mais informações, contate um administrador."
+)
+
+STREAM_TIMEOUT_MESSAGE = (
+    "Ops, parece que a solicitação expirou! Por favor, tente novamente. "
+    "Se o problema persistir, avise-nos. Obrigado pela paciência!"
+)
+STREAM_ERROR_MESSAGE = (
+    "Ops, algo deu errado! Por favor, tente novamente. "
+    "Se o problema persistir, avise-nos. Obrigado pela paciência!"
+)
+STREAM_INTERRUPTED_MESSAGE = (
+    "Ops, a conexão com o servidor foi interrompida inesperadamente! "
+    "Por favor, tente novamente mais tarde. Se o problema persistir, avise-nos."
+)
+
+# Validators that decode whole response bodies in a single pass
+THREADS_ADAPTER = TypeAdapter(list[Thread])
+MESSAGES_ADAPTER = TypeAdapter(list[Message])
+
+# Error messages that mention the messages cursor
+_AFTER_PATTERN = re.compile(r"\bafter\b")
+
+SEND_MESSAGE_TIMEOUT = httpx.Timeout(5.0, read=300.0)
+DELETE_THREAD_TIMEOUT = httpx.Timeout(5.0, read=60.0)
+
+
+class BaseAPIClient:
+    """Behaviour shared by the sync and async API clients."""
+
+    # Whether the website API accepts the batched token mutations.
+    # Shared by all clients and turned off the first time the API rejects them.
+    _auth_batching_supported: bool = settings.WEBSITE_AUTH_BATCHING
+
+    # Whether the chatbot API filters messages by cursor.
+    # Shared by all clients and turned off the first time the API rejects or ignores it.
+    _messages_cursor_supported: bool = settings.MESSAGES_CURSOR_SYNC
+
+    def __init__(self, base_website_url: str, base_chatbot_url: str):
+        self.base_website_url = base_website_url
+        self.base_chatbot_url = base_chatbot_url
+        self.logger = logger.bind(classname=self.__class__.__name__)
+
+    def with_token_store(self, token_store: TokenStore) -> "BaseAPIClient":
+        """Get a copy of this client that publishes refreshed tokens to another store.
+
+        The copy shares the HTTP client and the token manager with this client, so it is
+        cheap to create, e.g. for running API calls on worker threads or async tasks.
+
+        Args:
+            token_store (TokenStore): The token store.
+
+        Returns:
+            BaseAPIClient: The client copy.
+        """
+        client = copy.copy(self)
+        client.token_store = token_store
+        return client
+
+    def _is_auth_batching_unsupported(self, response: httpx.Response) -> bool:
+        """Check if a batched token mutation was rejected by the website API.
+
+        The rejection is a schema validation error, which graphene-django returns
+        with either a 200 or a 400 response. If so, batching is disabled for every
+        client of this process.
+
+        Args:
+            response (httpx.Response): The HTTP response.
+
+        Returns:
+            bool: Whether the website API does not support the batched mutations.
+        """
+        if not (response.is_success or response.status_code == httpx.codes.BAD_REQUEST):
+            return False
+
+        try:
+            body = response.json()
+        except ValueError:
+            return False
+
+        if not isinstance(body, dict):
+            return False
+
+        for error in body.get("errors") or []:
+            message = str(error.get("message", ""))
+            if "payload" in message and "Cannot query field" in message:
+                self.logger.warning(
+                    "[AUTH] Batched token mutations are not supported, "
+                    "falling back to sequential requests"
+                )
+                BaseAPIClient._auth_batching_supported = False
+                return True
+        return False
+
+    def _get_messages_params(self, after: uuid.UUID | None) -> dict[str, str]:
+        """Build the query parameters of a messages request.
+
+        Args:
+            after (uuid.UUID | None): The cursor, i.e. the id of the last known message.
+
+        Returns:
+            dict[str, str]: The query parameters.
+        """
+        params = {"order_by": "created_at"}
+
+        if after is not None:
+            params["after"] = str(after)
+
+        return params
+
+    def _is_cursor_rejected(self, response: httpx.Response) -> bool:
+        """Check if a cursor-based messages request was rejected by the chatbot API.
+
+        Only errors pointing at the `after` parameter count as a rejection, so other
+        client errors, e.g. a malformed thread id, do not turn the cursor off.
+        If so, cursor-based sync is disabled for every client of this process.
+
+        Args:
+            response (httpx.Response): The HTTP response.
+
+        Returns:
+            bool: Whether the chatbot API does not support the cursor.
+        """
+        if response.status_code not in (
+            httpx.codes.BAD_REQUEST,
+            httpx.codes.UNPROCESSABLE_ENTITY,
+        ):
+            return False
+
+        try:
+            detail = response.json().get("detail")
+        except (AttributeError, ValueError):
+            detail = None
+
+        # Validation errors carry the location of each invalid field
+        if isinstance(detail, list):
+            rejected = any(
+                isinstance(error, dict) and "after" in (error.get("loc") or [])
+                for error in detail
+            )
+        else:
+            rejected = _AFTER_PATTERN.search(response.text) is not None
+
+        if rejected:
+            self.logger.warning(
+                "[MESSAGE] Messages cursor was rejected, falling back to full fetches"
+            )
+            BaseAPIClient._messages_cursor_supported = False
+
+        return rejected
+
+    def _is_cursor_ignored(self, messages: list[Message], after: uuid.UUID) -> bool:
+        """Check if the chatbot API ignored the cursor and returned the whole thread.
+
+        If so, cursor-based sync is disabled for every client of this process.
+        The response is still usable, as merging a full history is idempotent.
+
+        Args:
+            messages (list[Message]): The messages returned by the API.
+            after (uuid.UUID): The cursor.
+
+        Returns:
+            bool: Whether the cursor was ignored.
+        """
+        if any(message.id == after for message in messages):
+            self.logger.warning(
+                "[MESSAGE] Messages cursor was ignored, falling back to full fetches"
+            )
+            BaseAPIClient._messages_cursor_supported = False
+            return True
+        return False
+
+    def _read_token(self, body: dict, field: str) -> str | None:
+        """Read the token returned by a token mutation.
+
+        If the response also carries the token payload, the chatbot access claim is
+        cached, so the following access verification needs no extra request.
+
+        Args:
+            body (dict): The GraphQL response body.
+            field (str): The mutation field, e.g. "tokenAuth" or "refreshToken".
+
+        Returns:
+            str | None: The token, or None if no token was returned.
+        """
+        result = (body.get("data") or {}).get(field)
+
+        if not result or not result.get("token"):
+            return None
+
+        token = result["token"]
+        payload = result.get("payload") or {}
+        has_chatbot_access = payload.get("has_chatbot_access")
+
+        if isinstance(has_chatbot_access, bool):
+            token_cache.set_access(token, has_chatbot_access)
+
+        return token
+
+    def _verify_token_locally(self, token: str) -> bool | None:
+        """Check if a user has chatbot access by verifying the token signature locally.
+
+        Args:
+            token (str): The user's access token.
+
+        Returns:
+            bool | None: Whether the user has chatbot access, or None if no verification
+                key is configured or the token could not be verified locally.
+        """
+        if settings.JWT_PUBLIC_KEY:
+            key = settings.JWT_PUBLIC_KEY
+        elif settings.JWT_SECRET_KEY:
+            key = settings.JWT_SECRET_KEY.get_secret_value()
+        else:
+            return None
+
+        try:
+            payload: dict = jwt.decode(
+                token, key=key, algorithms=[settings.JWT_ALGORITHM]
+            )
+        except Exception:
+            self.logger.warning("[AUTH] Local token verification failed")
+            return None
+
+        has_chatbot_access = payload.get("has_chatbot_access")
+
+        if not isinstance(has_chatbot_access, bool):
+            self.logger.warning("[AUTH] Token payload has no chatbot access claim")
+            return None
+
+        return has_chatbot_access
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response):
+        """Raise for HTTP errors, converting 403 into AccessForbiddenException.
+
+        Args:
+            response (httpx.Response): The HTTP response.
+
+        Raises:
+            AccessForbiddenException: If the response status code is 403 (Forbidden).
+            httpx.HTTPStatusError: If the response status code indicates any other error.
+        """
+        if response.status_code == httpx.codes.FORBIDDEN:
+            raise AccessForbiddenException
+        response.raise_for_status()
+
+    def _stream_fallback_events(
+        self, error_message: str | None
+    ) -> tuple[StreamEvent, StreamEvent]:
+        """Build the events that close a stream which did not complete.
+
+        Args:
+            error_message (str | None): The error that interrupted the stream, if any.
+
+        Returns:
+            tuple[StreamEvent, StreamEvent]: An `error` event followed by a `complete` event.
+        """
+        if not error_message:
+            self.logger.error("[MESSAGE] Stream terminated without a 'complete' status")
+            error_message = STREAM_INTERRUPTED_MESSAGE
+
+        return (
+            StreamEvent(
+                type="error", data=EventData(error_details={"message": error_message})
+            ),
+            StreamEvent(type="complete", data=EventData(run_id=uuid.uuid4())),
+        )
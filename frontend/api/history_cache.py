@@ -0,0 +1,205 @@
+import atexit
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from frontend.api.base import MESSAGES_ADAPTER
+from frontend.datatypes import Message
+from frontend.settings import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    user_key TEXT NOT NULL,
+    thread_id TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (user_key, thread_id)
+)
+"""
+
+
+class HistoryCache:
+    """Thread-safe on-disk cache of thread messages, backed by SQLite.
+
+    Messages are stored serialized, keyed by user and thread, so a conversation
+    can be painted right away after a browser refresh, a new session or a restart,
+    while the API is queried in the background. When the stored data grows past
+    the size limit, the least recently accessed threads are evicted.
+
+    Args:
+        directory (str | Path): Directory where the database file is created.
+        max_size (int): Maximum size of the stored messages, in bytes.
+    """
+
+    def __init__(self, directory: str | Path, max_size: int):
+        self.path = Path(directory) / "history.sqlite3"
+        self.max_size = max_size
+        self.logger = logger.bind(classname=self.__class__.__name__)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(_SCHEMA)
+
+    def get_messages(self, user_key: str, thread_id: str) -> list[Message] | None:
+        """Get the cached messages of a thread.
+
+        Args:
+            user_key (str): The user key.
+            thread_id (str): The thread unique identifier.
+
+        Returns:
+            list[Message] | None: The cached messages, or None if the thread is not
+                cached or its entry could not be read.
+        """
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT data FROM messages WHERE user_key = ? AND thread_id = ?",
+                    (user_key, str(thread_id)),
+                ).fetchone()
+
+                if row is None:
+                    return None
+
+                self._connection.execute(
+                    "UPDATE messages SET accessed_at = ? "
+                    "WHERE user_key = ? AND thread_id = ?",
+                    (time.time(), user_key, str(thread_id)),
+                )
+
+            return MESSAGES_ADAPTER.validate_json(row[0])
+        except Exception:
+            self.logger.exception(
+                f"[HISTORY CACHE] Error on cached messages retrieval for thread {thread_id}:"
+            )
+            return None
+
+    def put_messages(self, user_key: str, thread_id: str, messages: list[Message]):
+        """Store the messages of a thread, evicting other threads if needed.
+
+        Args:
+            user_key (str): The user key.
+            thread_id (str): The thread unique identifier.
+            messages (list[Message]): The messages.
+        """
+        try:
+            data = MESSAGES_ADAPTER.dump_json(messages)
+
+            # Threads larger than the whole cache would evict everything else
+            if len(data) > self.max_size:
+                self.delete_messages(user_key, thread_id)
+                return
+
+            with self._lock:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?)",
+                    (user_key, str(thread_id), data, len(data), time.time()),
+                )
+                self._evict()
+        except Exception:
+            self.logger.exception(
+                f"[HISTORY CACHE] Error on messages caching for thread {thread_id}:"
+            )
+
+    def delete_messages(self, user_key: str, thread_id: str):
+        """Remove the cached messages of a thread.
+
+        Args:
+            user_key (str): The user key.
+            thread_id (str): The thread unique identifier.
+        """
+        try:
+            with self._lock:
+                self._connection.execute(
+                    "DELETE FROM messages WHERE user_key = ? AND thread_id = ?",
+                    (user_key, str(thread_id)),
+                )
+        except Exception:
+            self.logger.exception(
+                f"[HISTORY CACHE] Error on cached messages deletion for thread {thread_id}:"
+            )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self):
+        """Evict the least recently accessed threads until the cache fits its size limit.
+
+        Must be called with the lock held.
+        """
+        (total_size,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM messages"
+        ).fetchone()
+
+        if total_size <= self.max_size:
+            return
+
+        rows = self._connection.execute(
+            "SELECT user_key, thread_id, size FROM messages ORDER BY accessed_at"
+        ).fetchall()
+
+        evicted = []
+
+        for user_key, thread_id, size in rows:
+            if total_size <= self.max_size:
+                break
+            evicted.append((user_key, thread_id))
+            total_size -= size
+
+        self._connection.executemany(
+            "DELETE FROM messages WHERE user_key = ? AND thread_id = ?", evicted
+        )
+        self.logger.info(f"[HISTORY CACHE] Evicted {len(evicted)} threads")
+
+
+_history_cache: HistoryCache | None = None
+_history_cache_failed = False
+_lock = threading.Lock()
+
+
+def get_history_cache() -> HistoryCache | None:
+    """Get the process-wide history cache, creating it on first use.
+
+    Returns:
+        HistoryCache | None: The history cache, or None if it is disabled
+            or its database could not be opened.
+    """
+    global _history_cache, _history_cache_failed
+
+    if settings.HISTORY_CACHE_DIR is None:
+        return None
+
+    with _lock:
+        if _history_cache is None and not _history_cache_failed:
+            try:
+                _history_cache = HistoryCache(
+                    directory=settings.HISTORY_CACHE_DIR,
+                    max_size=settings.HISTORY_CACHE_MAX_SIZE,
+                )
+            except Exception:
+                logger.exception("[HISTORY CACHE] Error on history cache creation:")
+                _history_cache_failed = True
+        return _history_cache
+
+
+def close_history_cache():
+    """Close the process-wide history cache database."""
+    global _history_cache
+
+    with _lock:
+        if _history_cache is not None:
+            _history_cache.close()
+            _history_cache = None
+
+
+atexit.register(close_history_cache)
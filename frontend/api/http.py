@@ -0,0 +1,86 @@
+import atexit
+import importlib.util
+import threading
+
+import httpx
+from loguru import logger
+
+from frontend.settings import settings
+
+_lock = threading.Lock()
+_client: httpx.Client | None = None
+
+
+def _http2_available() -> bool:
+    """Check if HTTP/2 is enabled and the optional `h2` package is installed.
+
+    Returns:
+        bool: Whether the shared client should negotiate HTTP/2.
+    """
+    if not settings.HTTP2_ENABLED:
+        return False
+
+    if importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "[HTTP] HTTP/2 is enabled but `h2` is not installed, using HTTP/1.1"
+        )
+        return False
+
+    return True
+
+
+def _get_limits() -> httpx.Limits:
+    """Build the connection pool limits from the settings.
+
+    Returns:
+        httpx.Limits: The connection pool limits.
+    """
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Get the process-wide HTTP client, creating it on first use.
+
+    The client is thread-safe and keeps a pool of keep-alive connections,
+    so it is shared by every API client, session and rerun of the process.
+
+    Returns:
+        httpx.Client: The shared HTTP client.
+    """
+    global _client
+
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(http2=_http2_available(), limits=_get_limits())
+            logger.info("[HTTP] Shared HTTP client created")
+        return _client
+
+
+def create_async_http_client() -> httpx.AsyncClient:
+    """Create an async HTTP client with the same pooling settings as the shared one.
+
+    Async clients are bound to the event loop they are used in, so they
+    are not shared process-wide and must be closed by their owner.
+
+    Returns:
+        httpx.AsyncClient: A new async HTTP client.
+    """
+    return httpx.AsyncClient(http2=_http2_available(), limits=_get_limits())
+
+
+def close_http_clients():
+    """Close the process-wide HTTP client and release its pooled connections."""
+    global _client
+
+    with _lock:
+        if _client is not None and not _client.is_closed:
+            _client.close()
+            logger.info("[HTTP] Shared HTTP client closed")
+        _client = None
+
+
+atexit.register(close_http_clients)
@@ -0,0 +1,111 @@
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from frontend.datatypes import StreamEvent
+
+
+class _LineSplitter:
+    """Split a stream of byte chunks into newline-delimited lines.
+
+    Partial lines are kept as a list of chunks and only joined once their
+    terminating newline arrives, so long lines are copied a single time.
+    """
+
+    def __init__(self):
+        self._pending: list[bytes] = []
+
+    def feed(self, chunk: bytes) -> Iterator[bytes]:
+        """Feed a chunk, yielding every line it completes.
+
+        Args:
+            chunk (bytes): The chunk.
+
+        Yields:
+            Iterator[bytes]: The completed non-empty lines, without the newline.
+        """
+        start = 0
+
+        while (end := chunk.find(b"\n", start)) != -1:
+            if self._pending:
+                self._pending.append(chunk[start:end])
+                line = b"".join(self._pending)
+                self._pending.clear()
+            else:
+                line = chunk[start:end]
+
+            if line.strip():
+                yield line
+
+            start = end + 1
+
+        if start < len(chunk):
+            self._pending.append(chunk[start:])
+
+    def flush(self) -> Iterator[bytes]:
+        """Yield the last line if the stream did not end with a newline.
+
+        Yields:
+            Iterator[bytes]: The remaining non-empty line.
+        """
+        line = b"".join(self._pending)
+        self._pending.clear()
+
+        if line.strip():
+            yield line
+
+
+def decode_stream_event(line: bytes) -> StreamEvent:
+    """Decode a single NDJSON line into a stream event.
+
+    The raw bytes are handed straight to the model's JSON validator, skipping
+    the decoding into `str` that line-based iteration does.
+
+    Args:
+        line (bytes): The raw JSON line.
+
+    Raises:
+        pydantic.ValidationError: If the line is not a valid stream event.
+
+    Returns:
+        StreamEvent: The stream event.
+    """
+    return StreamEvent.model_validate_json(line)
+
+
+def iter_stream_events(chunks: Iterable[bytes]) -> Iterator[StreamEvent]:
+    """Decode a stream of NDJSON byte chunks into stream events.
+
+    Args:
+        chunks (Iterable[bytes]): The raw byte chunks.
+
+    Yields:
+        Iterator[StreamEvent]: The decoded stream events.
+    """
+    splitter = _LineSplitter()
+
+    for chunk in chunks:
+        for line in splitter.feed(chunk):
+            yield decode_stream_event(line)
+
+    for line in splitter.flush():
+        yield decode_stream_event(line)
+
+
+async def aiter_stream_events(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[StreamEvent]:
+    """Async counterpart of `iter_stream_events`.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The raw byte chunks.
+
+    Yields:
+        AsyncIterator[StreamEvent]: The decoded stream events.
+    """
+    splitter = _LineSplitter()
+
+    async for chunk in chunks:
+        for line in splitter.feed(chunk):
+            yield decode_stream_event(line)
+
+    for line in splitter.flush():
+        yield decode_stream_event(line)
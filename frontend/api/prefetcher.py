@@ -0,0 +1,175 @@
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+from loguru import logger
+
+from frontend.api.api_client import APIClient
+from frontend.api.workers import get_prefetch_pool
+from frontend.datatypes import HistoryMessage, to_history
+
+
+def _estimate_size(history: list[HistoryMessage]) -> int:
+    """Estimate the memory taken by a chat history, in bytes.
+
+    Only the message contents and the serialized events are counted,
+    as they make up almost all of the size of long conversations.
+
+    Args:
+        history (list[HistoryMessage]): The chat history.
+
+    Returns:
+        int: The estimated size.
+    """
+    return sum(
+        len(message.content or "") + message.events.nbytes for message in history
+    )
+
+
+class MessagesPrefetcher:
+    """Prefetch the messages of a user's threads in the background.
+
+    Threads are fetched in the given order on the prefetch pool, with at most
+    `max_concurrency` requests in flight. Prefetched histories are kept until they
+    are taken, and prefetching stops once they would take more than `memory_budget`.
+
+    Args:
+        api (APIClient): The API client, which must publish refreshed tokens to an
+            `InMemoryTokenStore`, as it is used from worker threads.
+        access_token (str): User access token.
+        max_concurrency (int): Maximum number of concurrent requests.
+        memory_budget (int): Maximum estimated size of the prefetched histories, in bytes.
+    """
+
+    def __init__(
+        self,
+        api: APIClient,
+        access_token: str,
+        max_concurrency: int,
+        memory_budget: int,
+    ):
+        self.api = api
+        self.access_token = access_token
+        self.max_concurrency = max_concurrency
+        self.memory_budget = memory_budget
+        self.logger = logger.bind(classname=self.__class__.__name__)
+        # Reentrant, as done callbacks run in the calling thread when
+        # futures are already done or get cancelled while the lock is held
+        self._lock = threading.RLock()
+        self._pending: deque[str] = deque()
+        self._inflight: dict[str, Future] = {}
+        self._claimed: set[str] = set()
+        self._results: dict[str, tuple[list[HistoryMessage], int]] = {}
+        self._used = 0
+        self._cancelled = False
+
+    def start(self, thread_ids: list[str]):
+        """Start prefetching the messages of some threads.
+
+        Args:
+            thread_ids (list[str]): The threads unique identifiers, by priority.
+        """
+        with self._lock:
+            self._pending.extend(str(thread_id) for thread_id in thread_ids)
+            while len(self._inflight) < self.max_concurrency and self._pending:
+                self._submit_next()
+
+        self.logger.info(
+            f"[PREFETCH] Prefetching messages of {len(thread_ids)} threads"
+        )
+
+    def _submit_next(self):
+        """Submit the next pending thread to the prefetch pool.
+
+        Must be called with the lock held.
+        """
+        if self._cancelled or not self._pending:
+            return
+
+        thread_id = self._pending.popleft()
+        future = get_prefetch_pool().submit(self._fetch, thread_id)
+        self._inflight[thread_id] = future
+        future.add_done_callback(lambda f: self._on_done(thread_id, f))
+
+    def _fetch(self, thread_id: str) -> list[HistoryMessage] | None:
+        """Fetch the messages of a thread on a worker thread."""
+        if self._cancelled:
+            return None
+
+        messages = self.api.get_messages(self.access_token, thread_id)
+
+        return to_history(messages) if messages is not None else None
+
+    def _on_done(self, thread_id: str, future: Future):
+        """Keep a prefetched history if it fits the memory budget and submit the next thread."""
+        with self._lock:
+            self._inflight.pop(thread_id, None)
+
+            history = None
+            if not future.cancelled() and future.exception() is None:
+                history = future.result()
+
+            # Histories claimed while in flight are handed over by `pop`
+            if (
+                history is not None
+                and not self._cancelled
+                and thread_id not in self._claimed
+            ):
+                size = _estimate_size(history)
+
+                if self._used + size <= self.memory_budget:
+                    self._results[thread_id] = (history, size)
+                    self._used += size
+                else:
+                    self.logger.info(
+                        "[PREFETCH] Memory budget exhausted, stopping prefetch"
+                    )
+                    self._pending.clear()
+
+            self._claimed.discard(thread_id)
+            self._submit_next()
+
+    def pop(self, thread_id: str) -> list[HistoryMessage] | None:
+        """Take the prefetched history of a thread.
+
+        If the thread is being fetched, waits for it rather than fetching it twice.
+        Threads that were not fetched yet are dropped from the queue.
+
+        Args:
+            thread_id (str): The thread unique identifier.
+
+        Returns:
+            list[HistoryMessage] | None: The chat history, or None if the thread
+                was not prefetched or its prefetch failed.
+        """
+        thread_id = str(thread_id)
+
+        with self._lock:
+            if thread_id in self._results:
+                history, size = self._results.pop(thread_id)
+                self._used -= size
+                return history
+
+            future = self._inflight.get(thread_id)
+
+            if future is None:
+                if thread_id in self._pending:
+                    self._pending.remove(thread_id)
+                return None
+
+            self._claimed.add(thread_id)
+
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def cancel(self):
+        """Stop prefetching and drop the prefetched histories."""
+        with self._lock:
+            self._cancelled = True
+            self._pending.clear()
+            for future in list(self._inflight.values()):
+                future.cancel()
+            self._results.clear()
+            self._used = 0
@@ -0,0 +1,118 @@
+import httpx
+
+from frontend.datatypes import Thread
+from frontend.settings import settings
+from frontend.utils.lru import LRUCache
+
+
+class _ThreadsEntry:
+    __slots__ = ("etag", "last_modified", "threads")
+
+    def __init__(
+        self, etag: str | None, last_modified: str | None, threads: list[Thread]
+    ):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.threads = threads
+
+
+class ThreadsCache:
+    """Thread-safe LRU cache of the last threads listing of each user.
+
+    Each entry keeps the `ETag` and `Last-Modified` validators of the listing, which
+    are sent back in conditional requests, so a `304 Not Modified` response can be
+    answered with the cached threads. Users are identified by their token claims
+    rather than by the token itself, so entries outlive token refreshes.
+
+    Args:
+        maxsize (int): Maximum number of users whose listing is cached.
+    """
+
+    def __init__(self, maxsize: int):
+        self._cache: LRUCache[str, _ThreadsEntry] = LRUCache(maxsize)
+
+    def get_conditional_headers(self, user_key: str | None) -> dict[str, str]:
+        """Get the headers that make a threads listing request conditional.
+
+        Args:
+            user_key (str | None): The user key.
+
+        Returns:
+            dict[str, str]: The `If-None-Match` and `If-Modified-Since` headers,
+                or an empty dict if the user has no cached listing.
+        """
+        if user_key is None:
+            return {}
+
+        if (entry := self._cache.peek(user_key)) is None:
+            return {}
+
+        headers = {}
+
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        return headers
+
+    def get_not_modified(self, user_key: str | None) -> list[Thread] | None:
+        """Get the cached threads of a user after a `304 Not Modified` response.
+
+        Args:
+            user_key (str | None): The user key.
+
+        Returns:
+            list[Thread] | None: A copy of the cached threads, or None if the
+                user has no cached listing.
+        """
+        if user_key is None:
+            return None
+
+        if (entry := self._cache.get(user_key)) is None:
+            return None
+
+        self._cache.count("hits")
+        return list(entry.threads)
+
+    def put(
+        self, user_key: str | None, response: httpx.Response, threads: list[Thread]
+    ):
+        """Cache a threads listing along with its validators.
+
+        Listings without an `ETag` nor a `Last-Modified` header are not cached,
+        as they can never be revalidated.
+
+        Args:
+            user_key (str | None): The user key.
+            response (httpx.Response): The listing response.
+            threads (list[Thread]): The decoded threads.
+        """
+        if user_key is None:
+            return
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        self._cache.count("misses")
+
+        if not etag and not last_modified:
+            self._cache.pop(user_key)
+            return
+
+        self._cache.put(user_key, _ThreadsEntry(etag, last_modified, list(threads)))
+
+    def stats(self) -> dict[str, int]:
+        """Get the cache hit/miss counters and its current size.
+
+        Returns:
+            dict[str, int]: The cache statistics.
+        """
+        return self._cache.stats()
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        self._cache.clear()
+
+
+threads_cache = ThreadsCache(maxsize=settings.THREADS_CACHE_MAX_SIZE)
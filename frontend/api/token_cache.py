@@ -0,0 +1,172 @@
+import time
+
+import jwt
+
+from frontend.settings import settings
+from frontend.utils.lru import LRUCache
+
+# Token claims that identify a user, in order of preference
+USER_CLAIMS = ("user_id", "sub", "email", "username")
+
+
+class _TokenEntry:
+    __slots__ = ("expires_at", "has_chatbot_access", "issued_at")
+
+    def __init__(self, issued_at: float, expires_at: float):
+        self.issued_at = issued_at
+        self.expires_at = expires_at
+        self.has_chatbot_access: bool | None = None
+
+
+class TokenCache:
+    """Thread-safe LRU cache of decoded access tokens.
+
+    Each entry remembers the token's expiration and, once verified, whether the
+    token grants chatbot access. Entries live until the token expires and the
+    least recently used ones are evicted when the cache is full.
+
+    Args:
+        maxsize (int): Maximum number of tokens kept in the cache.
+    """
+
+    def __init__(self, maxsize: int):
+        self._cache: LRUCache[str, _TokenEntry] = LRUCache(
+            maxsize,
+            counters=("decode_hits", "decode_misses", "access_hits", "access_misses"),
+        )
+
+    def _get_entry(self, token: str) -> _TokenEntry | None:
+        """Get a live entry, dropping it if its token has already expired."""
+        entry = self._cache.get(token)
+
+        if entry is not None and entry.expires_at <= time.time():
+            self._cache.pop(token)
+            return None
+
+        return entry
+
+    def get_expiration(self, token: str) -> float | None:
+        """Get the expiration timestamp of a token, decoding it only on a cache miss.
+
+        Args:
+            token (str): The token.
+
+        Returns:
+            float | None: The `exp` claim as a POSIX timestamp, or None if the token
+                could not be decoded or has no expiration.
+        """
+        validity = self.get_validity(token)
+        return validity[1] if validity is not None else None
+
+    def get_validity(self, token: str) -> tuple[float, float] | None:
+        """Get the issue and expiration timestamps of a token, decoding it only on a cache miss.
+
+        Tokens without an `iat` claim, like the ones issued by graphql_jwt, are
+        considered issued when they are first seen, which for tokens received
+        from a login or a refresh is close enough.
+
+        Args:
+            token (str): The token.
+
+        Returns:
+            tuple[float, float] | None: The issue and expiration POSIX timestamps,
+                or None if the token could not be decoded or has no expiration.
+        """
+        entry = self._get_entry(token)
+        if entry is not None:
+            self._cache.count("decode_hits")
+            return entry.issued_at, entry.expires_at
+        self._cache.count("decode_misses")
+
+        try:
+            payload: dict = jwt.decode(token, options={"verify_signature": False})
+            expires_at = payload.get("exp")
+            issued_at = payload.get("iat")
+        except Exception:
+            return None
+
+        if not expires_at:
+            return None
+
+        expires_at = float(expires_at)
+        issued_at = float(issued_at) if issued_at else min(time.time(), expires_at)
+
+        # Expired tokens are not cached, since they would be dropped on the next lookup
+        if expires_at > time.time():
+            self._cache.put(token, _TokenEntry(issued_at, expires_at), replace=False)
+
+        return issued_at, expires_at
+
+    def get_access(self, token: str) -> bool | None:
+        """Get the cached chatbot access verification result of a token.
+
+        Args:
+            token (str): The token.
+
+        Returns:
+            bool | None: Whether the token grants chatbot access,
+                or None if it was not verified yet.
+        """
+        entry = self._get_entry(token)
+        if entry is not None and entry.has_chatbot_access is not None:
+            self._cache.count("access_hits")
+            return entry.has_chatbot_access
+        self._cache.count("access_misses")
+        return None
+
+    def set_access(self, token: str, has_chatbot_access: bool):
+        """Remember the chatbot access verification result of a token until it expires.
+
+        Args:
+            token (str): The token.
+            has_chatbot_access (bool): Whether the token grants chatbot access.
+        """
+        validity = self.get_validity(token)
+
+        # Tokens without an expiration are never cached, as there is no way
+        # of knowing when they become stale, and expired ones are already stale
+        if validity is None or validity[1] <= time.time():
+            return
+
+        entry = self._get_entry(token)
+        if entry is None:
+            entry = self._cache.put(token, _TokenEntry(*validity), replace=False)
+        entry.has_chatbot_access = has_chatbot_access
+
+    def stats(self) -> dict[str, int]:
+        """Get the cache hit/miss counters and its current size.
+
+        Returns:
+            dict[str, int]: The cache statistics.
+        """
+        return self._cache.stats()
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        self._cache.clear()
+
+
+def get_user_key(token: str) -> str | None:
+    """Get the key identifying the user a token was issued to.
+
+    Unlike the token itself, the key stays the same across token refreshes.
+
+    Args:
+        token (str): The access token.
+
+    Returns:
+        str | None: The user key, or None if the token has no identifying claim.
+    """
+    try:
+        payload: dict = jwt.decode(token, options={"verify_signature": False})
+    except Exception:
+        return None
+
+    for claim in USER_CLAIMS:
+        if value := payload.get(claim):
+            return f"{claim}:{value}"
+
+    return None
+
+
+token_cache = TokenCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE)
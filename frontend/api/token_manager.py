@@ -0,0 +1,222 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from loguru import logger
+
+from frontend.api.token_cache import token_cache
+from frontend.settings import settings
+
+# Tokens this close to their expiration (in seconds) must be refreshed before use
+EXPIRY_MARGIN = 60
+
+# Fraction of a token's lifetime, at its end, in which it is refreshed in the background
+REFRESH_AHEAD_RATIO = 0.2
+
+
+class TokenManager:
+    """Refresh access tokens ahead of their expiration, sharing in-flight refreshes.
+
+    A token that is still valid but inside the refresh-ahead window is returned
+    immediately while a refresh runs in the background. The window is the last
+    fifth of the token's lifetime, capped at `refresh_ahead` seconds, so short-lived
+    tokens are not refreshed as soon as they are issued. Only tokens that are
+    expired, or about to expire, make the caller wait for a refresh. Concurrent
+    callers holding the same token share a single refresh, and each refreshed
+    token is recorded as the successor of the old one, so callers still holding
+    the old token are handed the new one on their next call.
+
+    Args:
+        refresh_ahead (float): Maximum time before the expiration (in seconds) a
+            token starts being refreshed in the background.
+        max_workers (int): Maximum number of concurrent background refreshes.
+        max_successors (int): Maximum number of old tokens whose successors are kept.
+    """
+
+    def __init__(self, refresh_ahead: float, max_workers: int, max_successors: int):
+        self.refresh_ahead = refresh_ahead
+        self.max_workers = max_workers
+        self.max_successors = max_successors
+        self.logger = logger.bind(classname=self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._successors: OrderedDict[str, str] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._async_inflight: dict[tuple[int, str], asyncio.Task] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the background refresh executor, creating it on first use.
+
+        Must be called with the lock held.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="token-refresh"
+            )
+        return self._executor
+
+    def _resolve(self, token: str) -> str:
+        """Follow the successors chain of a token up to the most recent one.
+
+        Must be called with the lock held.
+        """
+        seen = set()
+        while token in self._successors and token not in seen:
+            seen.add(token)
+            token = self._successors[token]
+        return token
+
+    def _record_successor(self, token: str, refreshed_token: str):
+        """Record a refreshed token as the successor of the old one."""
+        with self._lock:
+            self._successors[token] = refreshed_token
+            self._successors.move_to_end(token)
+            while len(self._successors) > self.max_successors:
+                self._successors.popitem(last=False)
+
+    def _needs_refresh(self, token: str) -> tuple[bool, bool]:
+        """Check whether a token must be refreshed now or can be refreshed ahead.
+
+        Args:
+            token (str): The token.
+
+        Returns:
+            tuple[bool, bool]: Whether the token is expired and whether it is
+                inside the refresh-ahead window.
+        """
+        validity = token_cache.get_validity(token) if token else None
+
+        if validity is None:
+            return True, True
+
+        issued_at, expires_at = validity
+        lifetime = expires_at - issued_at
+        remaining = expires_at - time.time()
+
+        # Short-lived tokens get proportionally shorter windows
+        expiry_margin = min(EXPIRY_MARGIN, lifetime * REFRESH_AHEAD_RATIO / 2)
+        refresh_ahead = min(self.refresh_ahead, lifetime * REFRESH_AHEAD_RATIO)
+
+        return remaining <= expiry_margin, remaining <= refresh_ahead
+
+    def current_token(self, token: str) -> str:
+        """Get the most recent token known to succeed the given one.
+
+        Args:
+            token (str): The token.
+
+        Returns:
+            str: The most recent successor of the token, or the token itself.
+        """
+        with self._lock:
+            return self._resolve(token)
+
+    def _run_refresh(self, token: str, refresh: Callable[[str], str]) -> str:
+        """Run a refresh on a worker thread and record its result."""
+        try:
+            refreshed_token = refresh(token)
+            self._record_successor(token, refreshed_token)
+            return refreshed_token
+        except Exception as e:
+            self.logger.info(f"[AUTH] Token refresh failed: {e.__class__.__name__}")
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(token, None)
+
+    def _submit_refresh(self, token: str, refresh: Callable[[str], str]) -> Future:
+        """Start a refresh for a token, or join the one already in flight."""
+        with self._lock:
+            future = self._inflight.get(token)
+            if future is None:
+                future = self._get_executor().submit(self._run_refresh, token, refresh)
+                self._inflight[token] = future
+            return future
+
+    def get_token(self, token: str, refresh: Callable[[str], str]) -> str:
+        """Get a usable token, refreshing it if needed.
+
+        Args:
+            token (str): The token held by the caller.
+            refresh (Callable[[str], str]): Function that takes a token and returns a
+                refreshed one, raising if the session can no longer be refreshed.
+
+        Returns:
+            str: A token that is not about to expire.
+        """
+        token = self.current_token(token)
+        expired, refresh_ahead = self._needs_refresh(token)
+
+        if expired:
+            return self._submit_refresh(token, refresh).result()
+
+        if refresh_ahead:
+            self._submit_refresh(token, refresh)
+
+        return token
+
+    async def _run_async_refresh(
+        self, key: tuple[int, str], refresh: Callable[[str], Awaitable[str]]
+    ) -> str:
+        """Run a refresh on the event loop and record its result."""
+        token = key[1]
+        try:
+            refreshed_token = await refresh(token)
+            self._record_successor(token, refreshed_token)
+            return refreshed_token
+        except Exception as e:
+            self.logger.info(f"[AUTH] Token refresh failed: {e.__class__.__name__}")
+            raise
+        finally:
+            self._async_inflight.pop(key, None)
+
+    def _submit_async_refresh(
+        self, token: str, refresh: Callable[[str], Awaitable[str]]
+    ) -> asyncio.Task:
+        """Start a refresh task for a token, or join the one already in flight.
+
+        Tasks are bound to their event loop, so they are only shared within a loop.
+        """
+        key = (id(asyncio.get_running_loop()), token)
+        task = self._async_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_async_refresh(key, refresh))
+            self._async_inflight[key] = task
+        return task
+
+    async def aget_token(
+        self, token: str, refresh: Callable[[str], Awaitable[str]]
+    ) -> str:
+        """Async counterpart of `get_token`.
+
+        Args:
+            token (str): The token held by the caller.
+            refresh (Callable[[str], Awaitable[str]]): Coroutine function that takes
+                a token and returns a refreshed one, raising if the session can no
+                longer be refreshed.
+
+        Returns:
+            str: A token that is not about to expire.
+        """
+        token = self.current_token(token)
+        expired, refresh_ahead = self._needs_refresh(token)
+
+        if expired:
+            return await asyncio.shield(self._submit_async_refresh(token, refresh))
+
+        if refresh_ahead:
+            task = self._submit_async_refresh(token, refresh)
+            # Background failures are retried on the next call, so only mark them as retrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        return token
+
+
+token_manager = TokenManager(
+    refresh_ahead=settings.TOKEN_REFRESH_AHEAD,
+    max_workers=settings.TOKEN_REFRESH_WORKERS,
+    max_successors=settings.TOKEN_CACHE_MAX_SIZE,
+)
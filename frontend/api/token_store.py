@@ -0,0 +1,66 @@
+import threading
+from abc import ABC, abstractmethod
+
+import streamlit as st
+
+
+class TokenStore(ABC):
+    """Where the API clients read and publish the access token of a session."""
+
+    @abstractmethod
+    def get(self) -> str | None:
+        """Get the stored access token.
+
+        Returns:
+            str | None: The access token, or None if there is none.
+        """
+
+    @abstractmethod
+    def set(self, token: str):
+        """Store an access token, replacing the previous one.
+
+        Args:
+            token (str): The access token.
+        """
+
+
+class StreamlitTokenStore(TokenStore):
+    """Token store backed by the Streamlit session state.
+
+    Only usable from a Streamlit script thread, as the session state
+    is resolved from the script run context of the calling thread.
+
+    Args:
+        key (str, optional): The session state key. Defaults to "access_token".
+    """
+
+    def __init__(self, key: str = "access_token"):
+        self.key = key
+
+    def get(self) -> str | None:
+        return st.session_state.get(self.key)
+
+    def set(self, token: str):
+        st.session_state[self.key] = token
+
+
+class InMemoryTokenStore(TokenStore):
+    """Thread-safe token store holding the access token in memory.
+
+    Usable from worker threads, async tasks or outside of Streamlit.
+
+    Args:
+        token (str | None, optional): The initial access token. Defaults to None.
+    """
+
+    def __init__(self, token: str | None = None):
+        self._token = token
+        self._lock = threading.Lock()
+
+    def get(self) -> str | None:
+        with self._lock:
+            return self._token
+
+    def set(self, token: str):
+        with self._lock:
+            self._token = token
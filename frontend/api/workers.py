@@ -0,0 +1,63 @@
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from frontend.settings import settings
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_prefetch_executor: ThreadPoolExecutor | None = None
+
+
+def get_worker_pool() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool used to overlap API calls, creating it on first use.
+
+    Tasks submitted to this pool run off the Streamlit script thread, so they must not
+    touch `st.session_state` and should use a client with an `InMemoryTokenStore`.
+
+    Returns:
+        ThreadPoolExecutor: The shared thread pool.
+    """
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.API_WORKERS, thread_name_prefix="api-worker"
+            )
+        return _executor
+
+
+def get_prefetch_pool() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool used for prefetching, creating it on first use.
+
+    Prefetching is speculative, so it runs on a smaller pool of its own and never
+    takes the workers of the shared pool from logins and revalidations, which
+    users are waiting on. The same rules as for the shared pool apply to its tasks.
+
+    Returns:
+        ThreadPoolExecutor: The prefetch thread pool.
+    """
+    global _prefetch_executor
+
+    with _lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=settings.PREFETCH_WORKERS, thread_name_prefix="prefetch"
+            )
+        return _prefetch_executor
+
+
+def shutdown_worker_pool():
+    """Shut down the process-wide thread pools, cancelling pending tasks."""
+    global _executor, _prefetch_executor
+
+    with _lock:
+        for executor in (_executor, _prefetch_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _prefetch_executor = None
+
+
+atexit.register(shutdown_worker_pool)
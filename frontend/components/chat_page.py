@@ -1,27 +1,59 @@
 import json
+import time
 import uuid
+from collections import deque
+from collections.abc import Iterator
 from typing import Any
 
-import sqlparse
 import streamlit as st
 from loguru import logger
 from pydantic import UUID4
 from streamlit.delta_generator import DeltaGenerator
 from streamlit_extras.stylable_container import stylable_container
 
-from frontend.api import APIClient
-from frontend.components import typewrite, render_disclaimer
-from frontend.datatypes import Message, MessageRole, MessageStatus, StreamEvent
+from frontend.api import APIClient, InMemoryTokenStore
+from frontend.api.history_cache import get_history_cache
+from frontend.api.prefetcher import MessagesPrefetcher
+from frontend.api.token_cache import get_user_key
+from frontend.api.workers import get_worker_pool
+from frontend.components import render_disclaimer, typewrite
+from frontend.datatypes import (
+    CurrencyEscaper,
+    HistoryMessage,
+    Message,
+    MessageRole,
+    MessageStatus,
+    StreamEvent,
+    merge_history,
+    to_history,
+)
 from frontend.exceptions import AccessForbiddenException, SessionExpiredException
-from frontend.utils.constants import NEW_CHAT_KEY
+from frontend.settings import settings
+from frontend.utils.constants import CURRENT_PAGE_KEY, NEW_CHAT_KEY, PREFETCHER_KEY
 from frontend.utils.logos import BD_LOGO
+from frontend.utils.sql import sql_formatter
+from frontend.utils.streaming import batch_items
+from frontend.utils.tables import output_tables, table_artifact
+from frontend.utils.tool_outputs import output_previews
+
+# Interval (in seconds) at which a background history revalidation is polled
+REVALIDATION_POLL_INTERVAL = 0.5
+
+# Label of the status container while tool events are being streamed
+TOOL_EVENTS_LABEL = "Consultando a Base dos Dados..."
 
 
 class ChatPage:
     chat_history_key = "chat_history"
     delete_btn_key = "delete_btn"
+    expanded_events_key = "expanded_events"
     feedbacks_key = "feedbacks"
     feedback_clicked_key = "feedback_clicked"
+    history_reloaded_key = "history_reloaded"
+    history_window_key = "history_window"
+    output_pages_key = "output_pages"
+    revalidation_key = "revalidation"
+    sync_cursor_key = "sync_cursor"
     waiting_key = "waiting_for_answer"
 
     def __init__(
@@ -164,12 +196,15 @@ class ChatPage:
         st.session_state[self.page_id][self.feedback_clicked_key] = True
         self._handle_send_feedback(feedback_id, message_id)
 
-    def _render_message_buttons(self, message: Message):
+    @st.fragment
+    def _render_message_buttons(self, message: Message | HistoryMessage):
         """Render the feedback buttons on assistant's messages.
 
+        Rendered as a fragment, so clicking them only reruns the buttons themselves.
+
         Args:
-            message (Message):
-                A Message object containing:
+            message (Message | HistoryMessage):
+                A message containing:
                     - id: unique identifier.
                     - role: user or assistant
                     - content: message content.
@@ -205,8 +240,12 @@ class ChatPage:
             disabled=waiting_for_answer,
         )
 
+    @st.fragment
     def _render_delete_button(self):
-        """Render the chat deletion button."""
+        """Render the chat deletion button.
+
+        Rendered as a fragment, so opening the deletion dialog does not rerun the page.
+        """
 
         @st.dialog("Excluir conversa")
         def show_delete_chat_modal():
@@ -234,6 +273,11 @@ class ChatPage:
                         )
                         return
 
+                    if (history_cache := get_history_cache()) and (
+                        user_key := get_user_key(st.session_state["access_token"])
+                    ):
+                        history_cache.delete_messages(user_key, self.thread_id)
+
                     chat_pages: list[ChatPage] = st.session_state["chat_pages"]
 
                     for i, chat_page in enumerate(chat_pages):
@@ -265,6 +309,222 @@ class ChatPage:
             on_click=show_delete_chat_modal,
         )
 
+    def _render_history_events(self, message: HistoryMessage):
+        """Render the tool events of a message from the chat history.
+
+        Events are only decoded after the user asks for them,
+        as most old tool traces are never looked at.
+
+        Args:
+            message (HistoryMessage): The assistant message.
+
+        Returns:
+            bool: Whether the content of a spilled tool output was not available.
+        """
+        page_session_state = st.session_state[self.page_id]
+        expanded_events: set = page_session_state[self.expanded_events_key]
+        expanded = message.id in expanded_events
+
+        if message.content is not None:
+            label, state = "Concluído! Clique para ver os detalhes", "complete"
+        else:
+            label, state = "Erro", "error"
+
+        with st.status(label=label, state=state, expanded=expanded):
+            if not expanded:
+                st.button(
+                    label=f"Carregar detalhes ({message.events.count} eventos)",
+                    key=f"load_events_{message.id}",
+                    icon=":material/unfold_more:",
+                    type="tertiary",
+                    on_click=expanded_events.add,
+                    args=(message.id,),
+                )
+                return False
+
+            content_lost = False
+
+            try:
+                for event in message.events:
+                    content_lost |= _display_tool_event(
+                        event, output_pages=page_session_state[self.output_pages_key]
+                    )
+            except Exception:
+                self.logger.exception(
+                    f"Failed to decode events for message pair {message.id}:"
+                )
+                st.error(
+                    "Não foi possível exibir os detalhes.", icon=":material/error:"
+                )
+
+        return content_lost
+
+    def _load_prefetched_history(self) -> bool:
+        """Load the chat history prefetched after login, if any.
+
+        Returns:
+            bool: Whether the history was prefetched.
+        """
+        prefetcher: MessagesPrefetcher | None = st.session_state.get(PREFETCHER_KEY)
+
+        if prefetcher is None:
+            return False
+
+        chat_history = prefetcher.pop(self.thread_id)
+
+        if chat_history is None:
+            return False
+
+        page_session_state = st.session_state[self.page_id]
+        page_session_state[self.chat_history_key] = chat_history
+        page_session_state[self.sync_cursor_key] = (
+            chat_history[-1].id if chat_history else None
+        )
+
+        return True
+
+    def _paint_cached_history(self) -> bool:
+        """Paint the chat history from the on-disk cache and revalidate it in the background.
+
+        Returns:
+            bool: Whether the history was found in the cache.
+        """
+        history_cache = get_history_cache()
+        access_token = st.session_state["access_token"]
+        user_key = get_user_key(access_token)
+
+        if history_cache is None or user_key is None:
+            return False
+
+        messages = history_cache.get_messages(user_key, self.thread_id)
+
+        if not messages:
+            return False
+
+        page_session_state = st.session_state[self.page_id]
+        page_session_state[self.chat_history_key] = to_history(messages)
+        page_session_state[self.sync_cursor_key] = messages[-1].id
+
+        self._revalidate_history()
+
+        self.logger.info(
+            f"[HISTORY CACHE] Painted {len(messages)} cached messages for thread {self.thread_id}"
+        )
+        return True
+
+    def _revalidate_history(self):
+        """Fetch the messages created after the last synced one, or the whole thread if
+        none was synced, in the background.
+
+        The result is merged into the chat history by `_poll_revalidation`, so the
+        history is painted without waiting for the API.
+        """
+        access_token = st.session_state["access_token"]
+        page_session_state = st.session_state[self.page_id]
+
+        # The worker thread has no access to the session state, so
+        # the client publishes refreshed tokens to an in-memory store
+        api = self.api.with_token_store(InMemoryTokenStore(access_token))
+
+        page_session_state[self.revalidation_key] = get_worker_pool().submit(
+            api.get_messages,
+            access_token=access_token,
+            thread_id=self.thread_id,
+            after=page_session_state[self.sync_cursor_key],
+        )
+
+    def _sync_history(self, messages: list[Message]):
+        """Merge messages fetched from the API into the chat history and cache it on disk.
+
+        Args:
+            messages (list[Message]): The fetched messages.
+        """
+        page_session_state = st.session_state[self.page_id]
+
+        chat_history = merge_history(
+            page_session_state[self.chat_history_key],
+            messages,
+            page_session_state[self.sync_cursor_key],
+        )
+
+        page_session_state[self.chat_history_key] = chat_history
+        page_session_state[self.sync_cursor_key] = messages[-1].id
+
+        # Right after a sync, the whole history comes from the API
+        if (history_cache := get_history_cache()) and (
+            user_key := get_user_key(st.session_state["access_token"])
+        ):
+            history_cache.put_messages(
+                user_key,
+                self.thread_id,
+                [message.to_message() for message in chat_history],
+            )
+
+    def _reload_history(self):
+        """Fetch the whole thread again in the background, at most once per page.
+
+        Spilled tool outputs whose blob expired or was evicted only keep a preview,
+        which is also what the on-disk cache holds, and syncing from the cursor never
+        fetches their messages again. Reloading the thread spills them again under
+        the same blob keys, as these are the hashes of their content.
+        """
+        page_session_state = st.session_state[self.page_id]
+
+        if (
+            page_session_state.get(self.history_reloaded_key)
+            or page_session_state[self.waiting_key]
+            or self.revalidation_key in page_session_state
+        ):
+            return
+
+        self.logger.info(
+            f"[HISTORY] Reloading thread {self.thread_id} to restore tool outputs"
+        )
+
+        page_session_state[self.history_reloaded_key] = True
+
+        # Without a cursor, the fetched thread replaces the whole history
+        page_session_state[self.sync_cursor_key] = None
+        self._revalidate_history()
+        self._poll_revalidation()
+
+    @st.fragment(run_every=REVALIDATION_POLL_INTERVAL)
+    def _poll_revalidation(self):
+        """Merge the result of the background history revalidation once it is done.
+
+        The fragment reruns on its own until the revalidation is done, and is not
+        rendered anymore on the full rerun that follows.
+        """
+        page_session_state = st.session_state[self.page_id]
+        future = page_session_state.get(self.revalidation_key)
+
+        if future is None or not future.done():
+            return
+
+        del page_session_state[self.revalidation_key]
+
+        try:
+            messages = future.result()
+        except SessionExpiredException:
+            _show_session_expired_dialog()
+            return
+        except AccessForbiddenException:
+            _show_access_forbidden_dialog()
+            return
+
+        if messages:
+            self._sync_history(messages)
+
+        # The fragment is only rendered while a revalidation is pending, so a full
+        # rerun stops the polling, whether the history changed or not
+        st.rerun(scope="app")
+
+    def _handle_load_earlier_messages(self):
+        """Widen the history window to render earlier message pairs."""
+        st.session_state[self.page_id][self.history_window_key] += (
+            settings.CHAT_HISTORY_WINDOW
+        )
+
     def _handle_user_interaction(self):
         """Disable all chat message buttons, comments inputs and the chat input while
         the model is answering a question and enable the chat deletion button rendering.
@@ -272,6 +532,10 @@ class ChatPage:
         st.session_state[self.page_id][self.delete_btn_key] = False
         st.session_state[self.page_id][self.waiting_key] = True
 
+        # A pending revalidation would not know about the new message, so it is
+        # dropped and the history is synced again the next time the page is opened
+        st.session_state[self.page_id].pop(self.revalidation_key, None)
+
     def render(self):
         """Render the chat page."""
         # Placeholder for the subheader message
@@ -296,29 +560,73 @@ class ChatPage:
         if self.waiting_key not in page_session_state:
             page_session_state[self.waiting_key] = False
 
+        # Initialize the set of history messages whose events were loaded
+        if self.expanded_events_key not in page_session_state:
+            page_session_state[self.expanded_events_key] = set()
+
+        # Initialize the number of pages shown of each tool output
+        if self.output_pages_key not in page_session_state:
+            page_session_state[self.output_pages_key] = {}
+
+        # Initialize the number of message pairs rendered from history
+        if self.history_window_key not in page_session_state:
+            page_session_state[self.history_window_key] = settings.CHAT_HISTORY_WINDOW
+
         # Initialize chat deletion flag
         if self.delete_btn_key not in page_session_state:
             page_session_state[self.delete_btn_key] = self.thread_id is None
 
-        # Initialize chat history state
-        if self.chat_history_key not in page_session_state:
-            if self.thread_id is not None:
-                try:
-                    messages = self.api.get_messages(
-                        access_token=st.session_state["access_token"],
-                        thread_id=self.thread_id,
-                    )
-                except SessionExpiredException:
-                    _show_session_expired_dialog()
-                    return
-                except AccessForbiddenException:
-                    _show_access_forbidden_dialog()
-                    return
-            else:
-                messages = []
-            page_session_state[self.chat_history_key] = messages or []
+        # Check if the page was just opened, rather than rerun by an interaction on it
+        reopened = st.session_state.get(CURRENT_PAGE_KEY) != self.page_id
+        st.session_state[CURRENT_PAGE_KEY] = self.page_id
+
+        history_loaded = self.chat_history_key in page_session_state
+        prefetched = False
+
+        # Use a prefetched history if there is one. Otherwise, paint a cached
+        # history right away, while it is revalidated in the background
+        if self.thread_id is not None and not history_loaded:
+            prefetched = self._load_prefetched_history()
+            history_loaded = prefetched or self._paint_cached_history()
+
+        # Load the chat history on first render. When the page is reopened, only the
+        # messages created after the last synced one are fetched in the background
+        # and merged into it, so the known history is painted right away. A history
+        # that was just prefetched is not synced, as it was fetched after login
+        messages = None
+
+        if self.thread_id is not None and not history_loaded:
+            try:
+                messages = self.api.get_messages(
+                    access_token=st.session_state["access_token"],
+                    thread_id=self.thread_id,
+                )
+            except SessionExpiredException:
+                _show_session_expired_dialog()
+                return
+            except AccessForbiddenException:
+                _show_access_forbidden_dialog()
+                return
+        elif (
+            self.thread_id is not None
+            and reopened
+            and not prefetched
+            and not page_session_state[self.waiting_key]
+            and self.revalidation_key not in page_session_state
+        ):
+            self._revalidate_history()
+
+        if not history_loaded:
+            page_session_state[self.chat_history_key] = []
+            page_session_state[self.sync_cursor_key] = None
 
-        chat_history: list[Message] = page_session_state[self.chat_history_key]
+        if messages:
+            self._sync_history(messages)
+
+        if self.revalidation_key in page_session_state:
+            self._poll_revalidation()
+
+        chat_history: list[HistoryMessage] = page_session_state[self.chat_history_key]
 
         # Display the subheader message only if the chat history is empty
         if not chat_history:
@@ -327,8 +635,26 @@ class ChatPage:
 
         user_avatar = st.session_state.get("user_avatar")
 
-        # Display chat messages from history on app rerun
-        for message in chat_history:
+        # Display only the most recent message pairs from history on app rerun,
+        # letting the user page in earlier ones on demand
+        window_start = _get_window_start(
+            chat_history, page_session_state[self.history_window_key]
+        )
+
+        if window_start > 0:
+            st.button(
+                label="Carregar mensagens anteriores",
+                key=f"load_earlier_{self.page_id}",
+                icon=":material/history:",
+                type="tertiary",
+                on_click=self._handle_load_earlier_messages,
+            )
+
+        history_started = time.perf_counter()
+        sql_stats = sql_formatter.stats()
+        content_lost = False
+
+        for message in chat_history[window_start:]:
             if message.role == MessageRole.USER:
                 with st.chat_message("user", avatar=user_avatar):
                     st.write(message.content)
@@ -337,18 +663,8 @@ class ChatPage:
                 with st.chat_message("assistant", avatar=BD_LOGO):
                     st.empty()
 
-                    if _has_tool_events(message.events):
-                        if message.content is not None:
-                            label, state = (
-                                "Concluído! Clique para ver os detalhes",
-                                "complete",
-                            )
-                        else:
-                            label, state = "Erro", "error"
-
-                        with st.status(label=label, state=state):
-                            for event in message.events:
-                                _display_tool_event(event)
+                    if message.events.has_tool_events:
+                        content_lost |= self._render_history_events(message)
 
                     if message.status == MessageStatus.SUCCESS:
                         st.write(message.formatted_content)
@@ -357,6 +673,16 @@ class ChatPage:
 
                     self._render_message_buttons(message)
 
+        # The formatting time is process-wide, so it is approximate when
+        # several sessions are rendered at once
+        self.logger.debug(
+            f"[RENDER] History rendered in {time.perf_counter() - history_started:.4f}s, "
+            f"{sql_formatter.stats()['seconds'] - sql_stats['seconds']:.4f}s of which formatting SQL"
+        )
+
+        if content_lost and self.thread_id is not None:
+            self._reload_history()
+
         # Accept user input
         if user_prompt := st.chat_input(
             "Faça uma pergunta!",
@@ -372,7 +698,7 @@ class ChatPage:
                 status=MessageStatus.SUCCESS,
             )
 
-            chat_history.append(user_message)
+            chat_history.append(HistoryMessage.from_message(user_message))
 
             # Display user message in chat message container
             with st.chat_message("user", avatar=user_avatar):
@@ -388,16 +714,56 @@ class ChatPage:
             # Display assistant response in chat message container
             with st.chat_message("assistant", avatar=BD_LOGO):
                 events = []
+                artifacts = []
                 status_placeholder = st.empty()
 
-                status = status_placeholder.status("Pensando...")
+                status_label = "Pensando..."
+                status = status_placeholder.status(status_label)
+
+                # The events are received on a separate thread, which has
+                # no access to the session state to store refreshed tokens
+                access_token = st.session_state["access_token"]
+                api = self.api.with_token_store(InMemoryTokenStore(access_token))
 
                 try:
-                    for event in self.api.send_message(
-                        access_token=st.session_state["access_token"],
-                        message=user_prompt,
-                        thread_id=self.thread_id,
-                    ):
+                    # Events are received in batches at a bounded rate, so bursts of
+                    # tool events or answer deltas do not flood the connection
+                    batches = batch_items(
+                        api.send_message(
+                            access_token=access_token,
+                            message=user_prompt,
+                            thread_id=self.thread_id,
+                        ),
+                        interval=1 / settings.STREAM_UI_MAX_FPS,
+                        is_urgent=_is_terminal_event,
+                    )
+                    pending: deque[StreamEvent] = deque()
+                    answer_chunks: list[str] = []
+
+                    while True:
+                        if not pending:
+                            batch = next(batches, None)
+                            if batch is None:
+                                break
+                            pending.extend(batch)
+
+                        event = pending.popleft()
+
+                        if event.type == "answer_delta":
+                            # Write the answer as it arrives. Deltas are not kept in the
+                            # message events, as the answer is stored in its content
+                            pending.appendleft(event)
+                            st.write_stream(
+                                _iter_answer_deltas(pending, batches, answer_chunks)
+                            )
+                            message_content = "".join(answer_chunks)
+                            message_status = MessageStatus.SUCCESS
+                            label, state = (
+                                "Concluído! Clique para ver os detalhes",
+                                "complete",
+                            )
+                            continue
+
                         events.append(event)
 
                         if event.type == "final_answer":
@@ -418,22 +784,32 @@ class ChatPage:
                                 id=event.data.run_id,
                                 role=MessageRole.ASSISTANT,
                                 content=message_content,
-                                artifacts=[],
+                                artifacts=artifacts,
                                 events=events,
                                 status=message_status,
                             )
-                            if _has_tool_events(message.events):
+                            if _has_tool_events(events):
                                 status.update(label=label, state=state)
                             else:
                                 status_placeholder.empty()
                         else:
-                            status.update(label="Consultando a Base dos Dados...")
+                            # Label updates are collapsed, as it never changes
+                            # while tool events are being received
+                            if status_label != TOOL_EVENTS_LABEL:
+                                status_label = TOOL_EVENTS_LABEL
+                                status.update(label=status_label)
                             _display_tool_event(event, container=status)
 
-                    if message.status == MessageStatus.SUCCESS:
-                        st.write_stream(message.stream_words)
-                    else:
+                            if event.type == "tool_output":
+                                artifacts.extend(_get_table_artifacts(event))
+
+                    if message.status != MessageStatus.SUCCESS:
                         st.error(message.content)
+                    # Answers that were not streamed incrementally are replayed
+                    elif not answer_chunks:
+                        st.write_stream(
+                            message.stream_words(settings.ANSWER_REPLAY_MAX_DURATION)
+                        )
 
                     # Render buttons immediately to ensure a complete UI before the reload.
                     # NOTE: These specific buttons are discarded on the st.rerun() below,
@@ -447,7 +823,7 @@ class ChatPage:
                     return
 
             # Add message pair to chat history
-            chat_history.append(message)
+            chat_history.append(HistoryMessage.from_message(message))
 
         # Render the chat deletion button
         self._render_delete_button()
@@ -507,6 +883,86 @@ def _clear_new_chat_page():
     st.session_state[NEW_CHAT_KEY] = None
 
 
+def _get_window_start(chat_history: list[HistoryMessage], n_pairs: int) -> int:
+    """Get the index of the first history message inside the rendering window.
+
+    Args:
+        chat_history (list[HistoryMessage]): The chat history.
+        n_pairs (int): Number of most recent message pairs to render.
+            If zero or negative, the whole history is rendered.
+
+    Returns:
+        int: The index of the first message to render.
+    """
+    if n_pairs <= 0:
+        return 0
+
+    n_user_messages = 0
+
+    for i in range(len(chat_history) - 1, -1, -1):
+        if chat_history[i].role == MessageRole.USER:
+            n_user_messages += 1
+            if n_user_messages == n_pairs:
+                return i
+
+    return 0
+
+
+def _iter_answer_deltas(
+    pending: deque[StreamEvent],
+    batches: Iterator[list[StreamEvent]],
+    chunks: list[str],
+) -> Iterator[str]:
+    """Yield the text of consecutive answer deltas, as their batches arrive.
+
+    Stops at the first event that is not an answer delta, which is left in `pending`.
+
+    Args:
+        pending (deque[StreamEvent]): Events received but not processed yet.
+        batches (Iterator[list[StreamEvent]]): The batches of events still to be received.
+        chunks (list[str]): List the raw text of the deltas is appended to.
+
+    Yields:
+        Iterator[str]: The answer text received in each batch, with currency symbols escaped.
+    """
+    escaper = CurrencyEscaper()
+
+    while True:
+        start = len(chunks)
+
+        while pending and pending[0].type == "answer_delta":
+            chunks.append(pending.popleft().data.content or "")
+
+        # Each delta is escaped once. A dollar sign whose meaning depends on
+        # the next deltas is held back until they arrive
+        if text := escaper.feed("".join(chunks[start:])):
+            yield text
+
+        if not pending:
+            batch = next(batches, None)
+
+            if batch is not None:
+                pending.extend(batch)
+                continue
+
+        if text := escaper.flush():
+            yield text
+
+        return
+
+
+def _is_terminal_event(event: StreamEvent) -> bool:
+    """Check if an event ends the tool-calling phase of a stream, and must be shown right away.
+
+    Args:
+        event (StreamEvent): The stream event.
+
+    Returns:
+        bool: Whether the event is a final answer, an error or the stream completion.
+    """
+    return event.type in ("final_answer", "error", "complete")
+
+
 def _has_tool_events(events: list[StreamEvent]) -> bool:
     """Check if there are any tool-related events in the event list.
 
@@ -569,37 +1025,68 @@ def _format_tool_args(args: dict[str, Any]) -> str:
     if not sql_query:
         return json.dumps(args, indent=2, ensure_ascii=False)
 
-    sql_query = sqlparse.format(sql_query.strip(), reindent=True, keyword_case="upper")
+    sql_query = sql_formatter.format(sql_query)
 
     sql_block = f'  "sql_query": `\n{sql_query}\n`'
 
     return "{\n" + sql_block + "\n}"
 
 
-def _format_tool_outputs(results: str) -> str:
-    """Pretty-print tool call outputs.
+def _get_table_artifacts(event: StreamEvent) -> list[dict[str, Any]]:
+    """Get the artifacts describing the tables of a tool output event.
 
     Args:
-        results (str): Tool call results as a JSON string.
+        event (StreamEvent): The tool output event.
 
     Returns:
-        str: Formatted JSON string.
+        list[dict[str, Any]]: An artifact for each tabular tool output.
+    """
+    return [
+        table_artifact(tool_output, table)
+        for tool_output in event.data.tool_outputs
+        if tool_output.status == "success"
+        and (table := output_tables.get(tool_output)) is not None
+    ]
+
+
+def _show_more_output(output_pages: dict[str, int], tool_call_id: str):
+    """Show one more page of a tool output.
+
+    Args:
+        output_pages (dict[str, int]): Number of pages shown of each tool output.
+        tool_call_id (str): The tool call unique identifier.
     """
-    return json.dumps(json.loads(results), ensure_ascii=False, indent=2)
+    output_pages[tool_call_id] = output_pages.get(tool_call_id, 1) + 1
 
 
-def _display_tool_event(event: StreamEvent, container: DeltaGenerator | None = None):
+def _display_tool_event(
+    event: StreamEvent,
+    container: DeltaGenerator | None = None,
+    output_pages: dict[str, int] | None = None,
+) -> bool:
     """Render a tool-related event in the Streamlit UI.
 
     Displays messages, tool call arguments, and tool outputs
     with appropriate formatting and code block sizing.
 
+    Only the first pages of tool outputs are formatted and rendered, so large
+    outputs do not weigh on every rerun.
+
     Args:
         event (StreamEvent): The tool event to display.
         container (DeltaGenerator | None, optional): Streamlit container
             to render into. If None, uses st directly. Defaults to None.
+        output_pages (dict[str, int] | None, optional): Number of pages shown
+            of each tool output, by tool call. If given, a button to show one
+            more page is rendered below truncated outputs. Otherwise, only the
+            first page is shown. Defaults to None.
+
+    Returns:
+        bool: Whether the content of a tool output spilled to the blob store was
+            not available anymore, in which case only its preview is shown.
     """
     ctx = container if container is not None else st
+    content_lost = False
 
     if event.type == "tool_call":
         if event.data.content:
@@ -620,5 +1107,41 @@ def _display_tool_event(event: StreamEvent, container: DeltaGenerator | None = N
                         "Resposta muito extensa. Exibindo resultados parciais.",
                         icon=":material/info:",
                     )
-                tool_outputs = _format_tool_outputs(tool_output.content)
+                tool_call_id = tool_output.tool_call_id
+
+                # Tabular outputs are sent to the browser as Arrow tables, which
+                # are shown with virtualized scrolling whatever their size
+                if (table := output_tables.get(tool_output)) is not None:
+                    ctx.markdown(f"Resposta ({table.num_rows} linhas):")
+                    ctx.dataframe(table, hide_index=True)
+                    continue
+
+                # Large outputs spilled to the blob store are only loaded
+                # when they are not cached, and might not be available anymore
+                if (preview := output_previews.get(tool_output)) is None:
+                    ctx.info(
+                        "O conteúdo completo desta resposta não está disponível "
+                        "no momento. Exibindo uma prévia.",
+                        icon=":material/info:",
+                    )
+                    _display_code_block(
+                        f"Resposta:\n{tool_output.content}\n...", container=ctx
+                    )
+                    content_lost = True
+                    continue
+
+                pages = output_pages.get(tool_call_id, 1) if output_pages else 1
+                tool_outputs = preview.render(pages)
                 _display_code_block(f"Resposta:\n{tool_outputs}", container=ctx)
+
+                if output_pages is not None and preview.has_more(pages):
+                    ctx.button(
+                        label="Mostrar mais",
+                        key=f"show_more_{tool_call_id}",
+                        icon=":material/expand_more:",
+                        type="tertiary",
+                        on_click=_show_more_output,
+                        args=(output_pages, tool_call_id),
+                    )
+
+    return content_lost
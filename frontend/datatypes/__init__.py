@@ -1,19 +1,41 @@
 from .datatypes import (
+    CurrencyEscaper,
     EventData,
+    EventLog,
+    LoginResult,
     Message,
     MessageRole,
     MessageStatus,
     StreamEvent,
     Thread,
     UserMessage,
+    escape_currency,
+)
+from .history import (
+    HistoryMessage,
+    merge_history,
+    output_digest,
+    restore_output,
+    spill_events,
+    to_history,
 )
 
 __all__ = [
+    "CurrencyEscaper",
     "EventData",
+    "EventLog",
+    "HistoryMessage",
+    "LoginResult",
     "Message",
     "MessageRole",
     "MessageStatus",
     "StreamEvent",
     "Thread",
     "UserMessage",
+    "escape_currency",
+    "merge_history",
+    "output_digest",
+    "restore_output",
+    "spill_events",
+    "to_history",
 ]
@@ -1,13 +1,24 @@
 import re
 import time
 import uuid
-from collections.abc import Generator
+from collections.abc import Generator, Iterable, Iterator
 from datetime import datetime
 from enum import Enum
 from typing import Any, Literal
 
 from loguru import logger
-from pydantic import UUID4, BaseModel, ConfigDict, Field, JsonValue, field_validator
+from pydantic import (
+    UUID4,
+    BaseModel,
+    ConfigDict,
+    Field,
+    GetCoreSchemaHandler,
+    JsonValue,
+    PrivateAttr,
+    TypeAdapter,
+    field_validator,
+)
+from pydantic_core import core_schema, from_json, to_json
 
 
 class Thread(BaseModel):
@@ -17,6 +28,13 @@ class Thread(BaseModel):
     created_at: datetime
 
 
+class LoginResult(BaseModel):
+    access_token: str | None = None
+    message: str
+    threads: list[Thread] | None = None
+    timings: dict[str, float] = Field(default_factory=dict)
+
+
 class UserMessage(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     content: str
@@ -45,6 +63,7 @@ class ToolOutput(BaseModel):
 EventType = Literal[
     "tool_call",
     "tool_output",
+    "answer_delta",
     "final_answer",
     "error",
     "complete",
@@ -64,6 +83,81 @@ class StreamEvent(BaseModel):
     data: EventData
 
 
+class EventLog:
+    """Compact, lazily decoded list of the stream events of a message.
+
+    Events are kept as their serialized JSON, along with the number of events and
+    whether any of them is tool-related. Iterating the log decodes the events into
+    `StreamEvent` objects, which are not kept, so only messages whose events are
+    actually displayed pay for their decoding.
+
+    Args:
+        events (Iterable[StreamEvent | dict] | None, optional): The stream events,
+            as models or as their JSON-compatible dicts. Defaults to None.
+    """
+
+    __slots__ = ("_raw", "count", "has_tool_events")
+
+    def __init__(self, events: Iterable[StreamEvent | dict] | None = None):
+        events = list(events or [])
+        types = [
+            event.type if isinstance(event, StreamEvent) else event.get("type")
+            for event in events
+        ]
+        self._raw = to_json(events) if events else b""
+        self.count = len(events)
+        self.has_tool_events = any(
+            event_type in ("tool_call", "tool_output") for event_type in types
+        )
+
+    def __iter__(self) -> Iterator[StreamEvent]:
+        if self._raw:
+            yield from _EVENTS_ADAPTER.validate_json(self._raw)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return f"EventLog(count={self.count}, has_tool_events={self.has_tool_events})"
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the serialized events, in bytes."""
+        return len(self._raw)
+
+    def to_python(self) -> list:
+        """Get the events as JSON-compatible Python objects, without validating them.
+
+        Returns:
+            list: The events.
+        """
+        return from_json(self._raw) if self._raw else []
+
+    @classmethod
+    def _validate(cls, value: Any) -> "EventLog":
+        if isinstance(value, cls):
+            return value
+        if value is None:
+            return cls()
+        if isinstance(value, list):
+            return cls(value)
+        raise ValueError("events must be a list")
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda value: value.to_python()
+            ),
+        )
+
+
+_EVENTS_ADAPTER = TypeAdapter(list[StreamEvent])
+
+
 class MessageRole(str, Enum):
     ASSISTANT = "ASSISTANT"
     USER = "USER"
@@ -74,30 +168,174 @@ class MessageStatus(str, Enum):
     SUCCESS = "SUCCESS"
 
 
-class Message(BaseModel):
-    id: UUID4 = Field(default_factory=uuid.uuid4)
-    role: MessageRole
-    content: str
-    artifacts: list = Field(default_factory=list)
-    events: list[StreamEvent] = Field(default_factory=list)
-    status: MessageStatus
+# Regex to match math blocks ($$...$$), inline math ($...$), or single dollars ($)
+# Inline math must not contain white spaces at the beginning/end of the expression
+_CURRENCY_PATTERN = re.compile(
+    r"(\$\$[\s\S]*?\$\$)|(\$(?!\$)(?!\s)[^\$\n]*?[^\$\s]\$)|(\$)"
+)
 
-    @field_validator("artifacts", "events", mode="before")
-    @classmethod
-    def ensure_list(cls, value: list | None) -> list:
-        return value if value is not None else []
+
+def _escape_currency_match(match: re.Match) -> str:
+    return r"\$" if match.group(3) else match.group(0)
+
+
+def escape_currency(text: str) -> str:
+    """Escape currency dollar signs ($) while preserving markdown math expressions.
+
+    Args:
+        text (str): Input text.
+
+    Returns:
+        str: Text with currency dollar signs escaped.
+    """
+    return _CURRENCY_PATTERN.sub(_escape_currency_match, text)
+
+
+class CurrencyEscaper:
+    """Incremental version of `escape_currency`, for text received in chunks.
+
+    Each chunk is escaped once. Whether a dollar sign opens a math expression depends
+    on the text after it, so only the tail starting at a dollar sign that can not be
+    resolved yet is held back, until more text arrives or the escaper is flushed.
+    The concatenated output is the same as `escape_currency` on the whole text.
+    """
+
+    __slots__ = ("_tail",)
+
+    def __init__(self):
+        self._tail = ""
+
+    def feed(self, chunk: str) -> str:
+        """Escape a chunk of text.
+
+        Args:
+            chunk (str): The next chunk of text.
+
+        Returns:
+            str: The escaped text that could be resolved so far, possibly empty.
+        """
+        self._tail += chunk
+        return self._escape(final=False)
+
+    def flush(self) -> str:
+        """Escape the text held back, as the end of the text.
+
+        Returns:
+            str: The escaped remaining text.
+        """
+        return self._escape(final=True)
+
+    def _escape(self, final: bool) -> str:
+        text = self._tail
+        size = len(text)
+        parts = []
+        start = 0
+
+        # Text is copied up to each dollar sign, until one can not be resolved yet
+        while (i := text.find("$", start)) != -1:
+            parts.append(text[start:i])
+            start = i
+
+            if i + 1 == size:
+                if not final:
+                    break
+                end = None
+            elif text[i + 1] == "$":
+                # Math block, closed by the next "$$"
+                close = text.find("$$", i + 2)
+                if close == -1 and not final:
+                    break
+                end = close + 2 if close != -1 else None
+            elif text[i + 1].isspace():
+                end = None
+            else:
+                # Inline math, closed by the next "$" in the same line
+                close = text.find("$", i + 2)
+                newline = text.find("\n", i + 2, close if close != -1 else size)
+                if close == -1 and newline == -1 and not final:
+                    break
+                end = None
+                if close != -1 and newline == -1 and not text[close - 1].isspace():
+                    end = close + 1
+
+            if end is None:
+                parts.append(r"\$")
+                start = i + 1
+            else:
+                parts.append(text[i:end])
+                start = end
+        else:
+            parts.append(text[start:])
+            start = size
+
+        self._tail = text[start:]
+
+        return "".join(parts)
+
+
+def _paced(
+    tokens: list[str], delay: float, max_duration: float | None
+) -> Generator[str]:
+    """Yield tokens with a delay between them, within an optional time budget.
+
+    If yielding the tokens one by one would take longer than the budget, they
+    are grouped, so the number of pauses, and of UI updates, stays bounded.
+
+    Args:
+        tokens (list[str]): The tokens.
+        delay (float): Delay after each yielded chunk, in seconds.
+        max_duration (float | None): Maximum duration of the whole animation,
+            in seconds. If None, tokens are yielded one by one.
+
+    Yields:
+        Generator[str]: The tokens, one by one or joined in chunks.
+    """
+    if max_duration is not None and max_duration <= 0:
+        yield "".join(tokens)
+        return
+
+    chunk_size = 1
+
+    if max_duration is not None and len(tokens) * delay > max_duration:
+        max_steps = max(int(max_duration / delay), 1)
+        chunk_size = -(-len(tokens) // max_steps)
+
+    for i in range(0, len(tokens), chunk_size):
+        yield "".join(tokens[i : i + chunk_size])
+        time.sleep(delay)
+
+
+class MessageContentMixin:
+    """Rendering helpers shared by messages exposing `id` and `content` attributes."""
+
+    __slots__ = ()
 
     @property
     def formatted_content(self) -> str | None:
-        """Assistant message with currency symbols escaped for markdown rendering."""
-        if self.content:
+        """Assistant message with currency symbols escaped for markdown rendering.
+
+        The escaped content is memoized, as it is read on every rerun.
+        """
+        content = self.content
+
+        if content:
+            memo = self._formatted
+            if memo is not None and memo[0] is content:
+                return memo[1]
             try:
-                return self._escape_currency(self.content)
+                formatted = self._escape_currency(content)
             except Exception:
                 logger.exception(
                     f"Failed to escape currency symbols for message pair {self.id}:"
                 )
-        return self.content
+            else:
+                self._set_formatted((content, formatted))
+                return formatted
+        return content
+
+    def _set_formatted(self, memo: tuple[str, str]):
+        """Store the memoized escaped content, along with the content it was computed from."""
+        object.__setattr__(self, "_formatted", memo)
 
     def _escape_currency(self, text: str):
         """Escape currency dollar signs ($) while preserving markdown math expressions.
@@ -108,38 +346,52 @@ class Message(BaseModel):
         Returns:
             str: Text with currency dollar signs escaped.
         """
-        # Regex to match math blocks ($$...$$), inline math ($...$), or single dollars ($)
-        # Inline math must not contain white spaces at the beginning/end of the expression
-        pattern = r"(\$\$[\s\S]*?\$\$)|(\$(?!\$)(?!\s)[^\$\n]*?[^\$\s]\$)|(\$)"
-
-        def repl(match: re.Match):
-            if match.group(1):
-                return match.group(1)
-            elif match.group(2):
-                return match.group(2)
-            else:
-                return r"\$"
-
-        return re.sub(pattern, repl, text)
+        return escape_currency(text)
 
-    def stream_characters(self) -> Generator[str]:
+    def stream_characters(self, max_duration: float | None = None) -> Generator[str]:
         """Streams the assistant message character by character.
 
+        Args:
+            max_duration (float | None, optional): Maximum duration of the whole
+                animation, in seconds. Defaults to None, for no limit.
+
         Yields:
             Generator[str].
         """
         if self.content:
-            for character in self.formatted_content:
-                yield character
-                time.sleep(0.01)
+            yield from _paced(list(self.formatted_content), 0.01, max_duration)
 
-    def stream_words(self) -> Generator[str]:
+    def stream_words(self, max_duration: float | None = None) -> Generator[str]:
         """Streams the assistant message word by word.
 
+        Args:
+            max_duration (float | None, optional): Maximum duration of the whole
+                animation, in seconds. Defaults to None, for no limit.
+
         Yields:
             Generator[str].
         """
         if self.content:
-            for word in filter(None, self.formatted_content.split(" ")):
-                yield word + " "
-                time.sleep(0.02)
+            words = [
+                word + " " for word in filter(None, self.formatted_content.split(" "))
+            ]
+            yield from _paced(words, 0.02, max_duration)
+
+
+class Message(MessageContentMixin, BaseModel):
+    id: UUID4 = Field(default_factory=uuid.uuid4)
+    role: MessageRole
+    content: str
+    artifacts: list = Field(default_factory=list)
+    events: EventLog = Field(default_factory=EventLog)
+    status: MessageStatus
+
+    _formatted: tuple[str, str] | None = PrivateAttr(default=None)
+
+    def _set_formatted(self, memo: tuple[str, str]):
+        self._formatted = memo
+
+    @field_validator("artifacts", mode="before")
+    @classmethod
+    def ensure_list(cls, value: list | None) -> list:
+        return value if value is not None else []
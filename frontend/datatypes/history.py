@@ -0,0 +1,250 @@
+import uuid
+
+from loguru import logger
+
+from frontend.datatypes.datatypes import (
+    EventLog,
+    Message,
+    MessageContentMixin,
+    MessageRole,
+    MessageStatus,
+    ToolOutput,
+)
+from frontend.settings import settings
+from frontend.utils.blob_store import get_blob_store, hash_blob
+
+
+def spill_events(events: EventLog) -> EventLog:
+    """Move the content of large tool outputs out of an event log, into the blob store.
+
+    The content of each spilled output is replaced by a preview, and a handle to the
+    blob is added to the output metadata, so it can be restored by `restore_output`.
+
+    Args:
+        events (EventLog): The event log.
+
+    Returns:
+        EventLog: An event log with large tool outputs spilled, or the same
+            event log if none was spilled or the blob store is disabled.
+    """
+    threshold = settings.BLOB_SPILL_THRESHOLD
+
+    if not events.has_tool_events or events.nbytes <= threshold:
+        return events
+
+    store = get_blob_store()
+
+    if store is None:
+        return events
+
+    raw_events = events.to_python()
+    spilled = 0
+
+    for event in raw_events:
+        if event.get("type") != "tool_output":
+            continue
+
+        for output in (event.get("data") or {}).get("tool_outputs") or []:
+            # Outputs received from the API use the alias of the content field
+            field = "output" if "output" in output else "content"
+            content = output.get(field)
+            metadata = output.get("metadata") or {}
+
+            if (
+                not isinstance(content, str)
+                or len(content) <= threshold
+                or not isinstance(metadata, dict)
+            ):
+                continue
+
+            try:
+                key = store.put(content.encode())
+            except Exception:
+                logger.exception("[BLOB STORE] Error on tool output spilling:")
+                return events
+
+            output[field] = content[: settings.BLOB_PREVIEW_SIZE]
+            output["metadata"] = {
+                **metadata,
+                "blob": {"key": key, "size": len(content)},
+            }
+            spilled += 1
+
+    return EventLog(raw_events) if spilled else events
+
+
+def _get_blob(tool_output: ToolOutput) -> dict | None:
+    """Get the handle to the blob of a tool output spilled by `spill_events`."""
+    metadata = tool_output.metadata
+    blob = metadata.get("blob") if isinstance(metadata, dict) else None
+    return blob if isinstance(blob, dict) else None
+
+
+def output_digest(tool_output: ToolOutput) -> str:
+    """Hash the whole content of a tool output, whether it was spilled or not.
+
+    Spilled outputs are hashed through the key of their blob, which is the hash of
+    their content, so their content does not need to be restored to be hashed.
+
+    Args:
+        tool_output (ToolOutput): The tool output.
+
+    Returns:
+        str: The hash of the tool output content.
+    """
+    if (blob := _get_blob(tool_output)) is not None:
+        return str(blob.get("key"))
+
+    return hash_blob(tool_output.content.encode("utf-8", "surrogatepass"))
+
+
+def restore_output(tool_output: ToolOutput) -> ToolOutput | None:
+    """Restore the content of a tool output spilled by `spill_events`.
+
+    Args:
+        tool_output (ToolOutput): The tool output.
+
+    Returns:
+        ToolOutput | None: The tool output with its whole content, the same tool
+            output if it was not spilled, or None if its content is not available
+            anymore, in which case the output only holds a preview.
+    """
+    if (blob := _get_blob(tool_output)) is None:
+        return tool_output
+
+    store = get_blob_store()
+    data = store.get(str(blob.get("key"))) if store is not None else None
+
+    if data is None:
+        return None
+
+    return tool_output.model_copy(update={"content": data.decode()})
+
+
+class HistoryMessage(MessageContentMixin):
+    """Compact, read-only record of a chat history message.
+
+    Unlike `Message`, a history message has no per-instance dict nor pydantic
+    bookkeeping: its attributes live in slots, role and status are shared enum
+    members and its events are kept serialized in an `EventLog`. Messages are
+    converted from and to `Message` at the API boundary, where large tool outputs
+    are spilled to the blob store.
+
+    Args:
+        id (uuid.UUID): The message unique identifier.
+        role (MessageRole): The message role.
+        content (str | None): The message content.
+        events (EventLog): The message stream events.
+        status (MessageStatus): The message status.
+        artifacts (tuple, optional): The message artifacts. Defaults to ().
+    """
+
+    __slots__ = ("_formatted", "artifacts", "content", "events", "id", "role", "status")
+
+    def __init__(
+        self,
+        id: uuid.UUID,
+        role: MessageRole,
+        content: str | None,
+        events: EventLog,
+        status: MessageStatus,
+        artifacts: tuple = (),
+    ):
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "role", MessageRole(role))
+        object.__setattr__(self, "content", content)
+        object.__setattr__(self, "events", events)
+        object.__setattr__(self, "status", MessageStatus(status))
+        object.__setattr__(self, "artifacts", tuple(artifacts))
+        object.__setattr__(self, "_formatted", None)
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"{self.__class__.__name__} is read-only")
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(id={self.id!r}, role={self.role.value}, "
+            f"status={self.status.value}, events={self.events!r})"
+        )
+
+    @classmethod
+    def from_message(cls, message: Message) -> "HistoryMessage":
+        """Build a history message from a `Message`.
+
+        Args:
+            message (Message): The message.
+
+        Returns:
+            HistoryMessage: The history message.
+        """
+        return cls(
+            id=message.id,
+            role=message.role,
+            content=message.content,
+            events=spill_events(message.events),
+            status=message.status,
+            artifacts=message.artifacts,
+        )
+
+    def to_message(self) -> Message:
+        """Convert the history message back into a `Message`.
+
+        Returns:
+            Message: The message.
+        """
+        return Message(
+            id=self.id,
+            role=self.role,
+            content=self.content,
+            artifacts=list(self.artifacts),
+            events=self.events,
+            status=self.status,
+        )
+
+
+def to_history(messages: list[Message]) -> list[HistoryMessage]:
+    """Convert messages received from the API into history messages.
+
+    Args:
+        messages (list[Message]): The messages.
+
+    Returns:
+        list[HistoryMessage]: The history messages.
+    """
+    return [HistoryMessage.from_message(message) for message in messages]
+
+
+def merge_history(
+    history: list[HistoryMessage], messages: list[Message], cursor: uuid.UUID | None
+) -> list[HistoryMessage]:
+    """Merge messages fetched from the API into a chat history.
+
+    The history is made of the messages already synced from the API, up to and
+    including the cursor, followed by the ones created locally since then. Fetched
+    messages that are not part of the synced prefix replace the local tail, as the
+    API is the source of truth for them. Messages already known are matched by id,
+    so merging a whole thread instead of just the newer messages is harmless.
+
+    Args:
+        history (list[HistoryMessage]): The chat history.
+        messages (list[Message]): The fetched messages, ordered by creation.
+        cursor (uuid.UUID | None): The id of the last message synced from the API.
+
+    Returns:
+        list[HistoryMessage]: The merged chat history.
+    """
+    synced = 0
+
+    if cursor is not None:
+        for i in range(len(history) - 1, -1, -1):
+            if history[i].id == cursor:
+                synced = i + 1
+                break
+
+    synced_ids = {message.id for message in history[:synced]}
+    new_messages = [message for message in messages if message.id not in synced_ids]
+
+    if not new_messages:
+        return history
+
+    return history[:synced] + to_history(new_messages)
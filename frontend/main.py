@@ -1,12 +1,19 @@
 import time
 
 import streamlit as st
+from loguru import logger
 
-from frontend.api import APIClient
+from frontend.api import APIClient, InMemoryTokenStore
+from frontend.api.prefetcher import MessagesPrefetcher
 from frontend.components.chat_page import ChatPage
-from frontend.exceptions import AccessForbiddenException, SessionExpiredException
+from frontend.exceptions import SessionExpiredException
 from frontend.settings import settings
-from frontend.utils.constants import NEW_CHAT_KEY
+from frontend.utils.constants import (
+    LOGIN_MESSAGE_KEY,
+    LOGIN_STARTED_AT_KEY,
+    NEW_CHAT_KEY,
+    PREFETCHER_KEY,
+)
 from frontend.utils.logging import setup_logger
 from frontend.utils.logos import BD_LOGO
 
@@ -14,15 +21,21 @@ setup_logger()
 
 st.set_page_config(page_title="Chatbot BD", page_icon=BD_LOGO)
 
-api = APIClient(settings.BASE_WEBSITE_URL, settings.BASE_CHATBOT_URL)
+
+@st.cache_resource(show_spinner=False)
+def get_api_client() -> APIClient:
+    """Get the process-wide API client, shared across sessions and reruns."""
+    return APIClient(settings.BASE_WEBSITE_URL, settings.BASE_CHATBOT_URL)
+
+
+api = get_api_client()
 
 
 def login():
     st.title("Entrar")
     st.caption("Por favor, insira seu e-mail e senha para continuar")
 
-    access_token = None
-    message = None
+    result = None
 
     with st.form("register_form"):
         email = st.text_input("E-mail")
@@ -31,44 +44,52 @@ def login():
         col1, _ = st.columns(2)
 
         if col1.form_submit_button("Entrar", type="primary"):
-            access_token, message = api.authenticate(email, password)
-
-    if access_token:
+            try:
+                result = api.login(email, password)
+            except SessionExpiredException:
+                st.session_state.clear()
+                st.error(
+                    "Sessão expirada durante o login. Por favor, tente novamente.",
+                    icon=":material/error:",
+                )
+
+    if result is not None and result.access_token:
         st.session_state["email"] = email
         st.session_state["logged_in"] = True
-        st.session_state["access_token"] = access_token
+        st.session_state["access_token"] = result.access_token
         st.session_state["user_avatar"] = (
             f"https://api.dicebear.com/9.x/initials/svg?seed={email[0]}&backgroundColor=7ec876&radius=50"
         )
-
-        try:
-            threads = api.get_threads(access_token)
-
-            if threads is not None:
-                st.session_state["chat_pages"] = [
-                    ChatPage(api, title=thread.title, thread_id=str(thread.id))
-                    for thread in threads
-                ]
-            else:
-                st.session_state["chat_pages"] = []
-
-            st.success(message, icon=":material/check:")
-            time.sleep(0.5)
-            st.rerun()
-        except SessionExpiredException:
-            st.session_state.clear()
-            st.error(
-                "Sessão expirada durante o login. Por favor, tente novamente.",
-                icon=":material/error:",
+        st.session_state["chat_pages"] = [
+            ChatPage(api, title=thread.title, thread_id=str(thread.id))
+            for thread in result.threads or []
+        ]
+
+        # Prefetch the messages of the most recent threads, so opening
+        # them right after login does not wait for the network
+        if settings.PREFETCH_THREADS and result.threads:
+            prefetcher = MessagesPrefetcher(
+                api=api.with_token_store(InMemoryTokenStore(result.access_token)),
+                access_token=result.access_token,
+                max_concurrency=settings.PREFETCH_CONCURRENCY,
+                memory_budget=settings.PREFETCH_MEMORY_BUDGET,
             )
-        except AccessForbiddenException:
-            st.session_state.clear()
-            st.error(
-                "Você não possui acesso ao chatbot. Para mais informações, contate um administrador.",
-                icon=":material/block:",
+            prefetcher.start(
+                [thread.id for thread in reversed(result.threads)][
+                    : settings.PREFETCH_THREADS
+                ]
             )
-    elif message is not None:
-        st.error(message, icon=":material/error:")
+            st.session_state[PREFETCHER_KEY] = prefetcher
+
+        # The success message is shown on the next run, right after the
+        # navigation is rebuilt for the logged in user, instead of delaying it
+        st.session_state[LOGIN_MESSAGE_KEY] = result.message
+        st.session_state[LOGIN_STARTED_AT_KEY] = (
+            time.perf_counter() - result.timings["total"]
+        )
+        st.rerun()
+    elif result is not None:
+        st.error(result.message, icon=":material/error:")
 
 
 def logout():
@@ -76,6 +97,8 @@ def logout():
     st.caption("Clique no botão abaixo para confirmar")
 
     if st.button("Sair", type="primary"):
+        if prefetcher := st.session_state.get(PREFETCHER_KEY):
+            prefetcher.cancel()
         st.session_state.clear()
         st.success("Desconectado com sucesso!", icon=":material/check:")
         time.sleep(0.5)
@@ -129,6 +152,9 @@ def about():
 
 
 if st.session_state.get("logged_in"):
+    if login_message := st.session_state.pop(LOGIN_MESSAGE_KEY, None):
+        st.toast(login_message, icon=":material/check:")
+
     about_page = st.Page(
         page=about, title="Conheça o App", icon=":material/lightbulb_2:"
     )
@@ -167,3 +193,8 @@ else:
     page = st.navigation(pages=[login_page], position="hidden")
 
 page.run()
+
+if (login_started_at := st.session_state.pop(LOGIN_STARTED_AT_KEY, None)) is not None:
+    logger.info(
+        f"[AUTH] Time to first screen after login: {time.perf_counter() - login_started_at:.4f}s"
+    )
@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from pydantic import Field, computed_field
+from pydantic import Field, SecretStr, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 NonEmptyStr = Annotated[str, Field(min_length=1)]
@@ -16,6 +16,14 @@ class Settings(BaseSettings):
     def BASE_WEBSITE_URL(self) -> str:
         return f"http://{self.WEBSITE_HOST}:{self.WEBSITE_PORT}"
 
+    WEBSITE_AUTH_BATCHING: bool = Field(
+        default=True,
+        description=(
+            "Whether token mutations should also request the token payload, verifying the chatbot access "
+            "in the same request. Falls back to a separate verifyToken request if the API rejects it."
+        ),
+    )
+
     # Chatbot API settings
     CHATBOT_HOST: NonEmptyStr = Field(description="chatbot API host")
     CHATBOT_PORT: NonEmptyStr = Field(description="chatbot API port")
@@ -25,6 +33,238 @@ class Settings(BaseSettings):
     def BASE_CHATBOT_URL(self) -> str:
         return f"http://{self.CHATBOT_HOST}:{self.CHATBOT_PORT}"
 
+    # HTTP client settings
+    HTTP_MAX_CONNECTIONS: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum number of concurrent connections kept by the shared HTTP client.",
+    )
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=20,
+        ge=0,
+        description="Maximum number of idle connections kept alive in the shared HTTP client pool.",
+    )
+    HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default=30.0,
+        ge=0,
+        description="Time in seconds an idle connection is kept alive in the pool before being closed.",
+    )
+    HTTP2_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Whether the shared HTTP client should negotiate HTTP/2 with the APIs. "
+            "Requires the optional `h2` package, otherwise HTTP/1.1 is used."
+        ),
+    )
+
+    API_WORKERS: int = Field(
+        default=8,
+        ge=1,
+        description="Number of threads used to run API calls concurrently, e.g. during login.",
+    )
+
+    # Conversation sync settings
+    MESSAGES_CURSOR_SYNC: bool = Field(
+        default=True,
+        description=(
+            "Whether reopened conversations fetch only the messages newer than the last known one. "
+            "Turned off automatically if the chatbot API does not support the cursor."
+        ),
+    )
+
+    THREADS_CACHE_MAX_SIZE: int = Field(
+        default=1024,
+        ge=1,
+        description=(
+            "Maximum number of users whose last threads listing is cached in memory "
+            "and revalidated with conditional requests."
+        ),
+    )
+
+    # Prefetch settings
+    PREFETCH_THREADS: int = Field(
+        default=5,
+        ge=0,
+        description=(
+            "Number of most recent threads whose messages are prefetched in the background after login. "
+            "Set to 0 to disable prefetching."
+        ),
+    )
+    PREFETCH_CONCURRENCY: int = Field(
+        default=2,
+        ge=1,
+        description="Maximum number of concurrent requests made by the messages prefetcher of a session.",
+    )
+    PREFETCH_WORKERS: int = Field(
+        default=2,
+        ge=1,
+        description=(
+            "Number of threads used to prefetch messages, shared by all sessions. "
+            "Kept apart from the API workers, so prefetching never delays logins."
+        ),
+    )
+    PREFETCH_MEMORY_BUDGET: int = Field(
+        default=32 * 1024 * 1024,
+        ge=0,
+        description="Maximum estimated size in bytes of the messages prefetched for a session.",
+    )
+
+    # History cache settings
+    HISTORY_CACHE_DIR: str | None = Field(
+        default=None,
+        description=(
+            "Directory of the on-disk cache of conversation messages, used to paint conversations "
+            "right away while they are revalidated against the API. Messages are stored unencrypted. "
+            "If not set, the cache is disabled."
+        ),
+    )
+    HISTORY_CACHE_MAX_SIZE: int = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        description="Maximum size in bytes of the messages stored in the on-disk history cache.",
+    )
+
+    # Chat page settings
+    CHAT_HISTORY_WINDOW: int = Field(
+        default=20,
+        ge=0,
+        description=(
+            "Number of most recent message pairs rendered from a conversation history. "
+            "Earlier pairs are paged in on demand by the same amount. Set to 0 to render the whole history."
+        ),
+    )
+
+    STREAM_UI_MAX_FPS: float = Field(
+        default=10.0,
+        gt=0,
+        description=(
+            "Maximum number of times per second the streamed tool events are rendered. "
+            "Events received in between are buffered and rendered together."
+        ),
+    )
+
+    ANSWER_REPLAY_MAX_DURATION: float = Field(
+        default=2.0,
+        ge=0,
+        description=(
+            "Maximum duration in seconds of the typing animation of answers that are not streamed "
+            "incrementally. Longer answers are typed in bigger chunks. Set to 0 to show them at once."
+        ),
+    )
+
+    # SQL formatting settings
+    SQL_FORMAT_CACHE_MAX_SIZE: int = Field(
+        default=512,
+        ge=1,
+        description="Maximum number of formatted SQL queries of tool calls kept in the in-memory cache.",
+    )
+    SQL_FORMAT_MAX_QUERY_SIZE: int = Field(
+        default=5000,
+        ge=0,
+        description=(
+            "Maximum length in characters of the SQL queries reindented with sqlparse. "
+            "Longer queries are formatted with a faster, lightweight formatter."
+        ),
+    )
+
+    # Tool output settings
+    TOOL_OUTPUT_PAGE_ROWS: int = Field(
+        default=50,
+        ge=1,
+        description="Maximum number of rows of a tool output shown per page. More pages are shown on demand.",
+    )
+    TOOL_OUTPUT_PAGE_SIZE: int = Field(
+        default=16 * 1024,
+        ge=1,
+        description="Maximum number of characters of a tool output shown per page. More pages are shown on demand.",
+    )
+    TOOL_OUTPUT_PREVIEW_CACHE_MAX_SIZE: int = Field(
+        default=64,
+        ge=1,
+        description=(
+            "Maximum number of formatted tool output previews kept in memory. "
+            "Each preview keeps a reference to its whole tool output."
+        ),
+    )
+    TOOL_OUTPUT_TABLE_CACHE_MAX_SIZE: int = Field(
+        default=64,
+        ge=1,
+        description="Maximum number of tool outputs whose tables, if they are tabular, are kept in memory.",
+    )
+
+    # Blob store settings
+    BLOB_STORE_DIR: str | None = Field(
+        default=None,
+        description=(
+            "Directory of the on-disk store where large tool outputs are moved out of the session "
+            "state, leaving a preview in the chat history. If not set, tool outputs are kept in memory."
+        ),
+    )
+    BLOB_STORE_MAX_SIZE: int = Field(
+        default=1024 * 1024 * 1024,
+        ge=0,
+        description="Maximum size in bytes of the blob store. The least recently used blobs are evicted first.",
+    )
+    BLOB_STORE_TTL: float = Field(
+        default=24 * 60 * 60,
+        gt=0,
+        description="Time in seconds after which a blob that was not used is removed from the blob store.",
+    )
+    BLOB_SPILL_THRESHOLD: int = Field(
+        default=64 * 1024,
+        ge=0,
+        description="Length in characters above which a tool output is moved to the blob store.",
+    )
+    BLOB_PREVIEW_SIZE: int = Field(
+        default=4096,
+        ge=0,
+        description="Length in characters of the preview kept in the chat history for tool outputs moved to the blob store.",
+    )
+
+    # Token cache settings
+    TOKEN_CACHE_MAX_SIZE: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum number of access tokens whose expiration and chatbot access are cached in memory.",
+    )
+
+    # Token refresh settings
+    TOKEN_REFRESH_AHEAD: float = Field(
+        default=300.0,
+        ge=60,
+        description=(
+            "Maximum time before the expiration (in seconds) an access token starts being refreshed in the background. "
+            "Tokens are refreshed in the last fifth of their lifetime, so short-lived tokens start later. "
+            "Requests only wait for a refresh when the token is less than a minute, or a tenth of its lifetime, "
+            "from expiring."
+        ),
+    )
+    TOKEN_REFRESH_WORKERS: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum number of access token refreshes running concurrently in the background.",
+    )
+
+    # Local token verification settings
+    JWT_PUBLIC_KEY: str | None = Field(
+        default=None,
+        description=(
+            "PEM encoded public key used to verify access token signatures locally. "
+            "When neither this nor JWT_SECRET_KEY is set, tokens are verified through the website API."
+        ),
+    )
+    JWT_SECRET_KEY: SecretStr | None = Field(
+        default=None,
+        description=(
+            "Shared secret used to verify access token signatures locally. "
+            "When neither this nor JWT_PUBLIC_KEY is set, tokens are verified through the website API."
+        ),
+    )
+    JWT_ALGORITHM: str = Field(
+        default="HS256",
+        description="Algorithm the access tokens are signed with, e.g. HS256 or RS256.",
+    )
+
     # Logging settings
     LOG_LEVEL: str = Field(
         default="INFO", description="The minimum severity level for logging messages."
@@ -0,0 +1,197 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from loguru import logger
+
+from frontend.settings import settings
+
+_KEY_PATTERN = re.compile(r"[0-9a-f]{40}")
+
+
+def hash_blob(data: bytes) -> str:
+    """Hash the content of a blob into its key.
+
+    Args:
+        data (bytes): The blob content.
+
+    Returns:
+        str: The blob key.
+    """
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+class BlobStore:
+    """Thread-safe, content-addressed store of blobs on disk.
+
+    Blobs are stored in files named after the hash of their content, so storing the
+    same content twice keeps a single copy.
+    Blobs not read nor written for longer than `ttl` seconds expire, and the least
+    recently used ones are evicted when the store grows past `max_size` bytes.
+
+    Args:
+        directory (str | Path): Directory where the blob files are created.
+        max_size (int): Maximum size of the stored blobs, in bytes.
+        ttl (float): Time to live of the blobs since they were last used, in seconds.
+    """
+
+    def __init__(self, directory: str | Path, max_size: int, ttl: float):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.logger = logger.bind(classname=self.__class__.__name__)
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = 0
+        self._sweep()
+
+    def put(self, data: bytes) -> str:
+        """Store a blob.
+
+        Args:
+            data (bytes): The blob content.
+
+        Returns:
+            str: The blob key.
+        """
+        key = hash_blob(data)
+        path = self._path(key)
+
+        with self._lock:
+            if path.exists():
+                os.utime(path)
+                return key
+
+            path.parent.mkdir(exist_ok=True)
+
+            # Written to a temporary file first, so a blob is never read half-written
+            temp_path = path.with_name(f".{key}.{uuid.uuid4().hex}")
+            temp_path.write_bytes(data)
+            os.replace(temp_path, path)
+            self._size += len(data)
+
+            if self._size > self.max_size or self._expired_since_sweep():
+                self._sweep()
+
+        return key
+
+    def get(self, key: str) -> bytes | None:
+        """Read a blob.
+
+        Args:
+            key (str): The blob key.
+
+        Returns:
+            bytes | None: The blob content, or None if the key is invalid
+                or the blob expired or was evicted.
+        """
+        if not _KEY_PATTERN.fullmatch(key):
+            return None
+
+        path = self._path(key)
+
+        try:
+            with self._lock:
+                if time.time() - path.stat().st_mtime > self.ttl:
+                    self._delete(path)
+                    return None
+                os.utime(path)
+
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.logger.exception(f"[BLOB STORE] Error on blob {key} retrieval:")
+            return None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _expired_since_sweep(self) -> bool:
+        return time.time() - self._last_sweep > min(self.ttl, 600)
+
+    def _delete(self, path: Path):
+        """Delete a blob file. Must be called with the lock held."""
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            self._size -= size
+        except FileNotFoundError:
+            pass
+
+    def _sweep(self):
+        """Delete expired blobs, then the least recently used ones until the store
+        fits its size limit. Must be called with the lock held, or on creation.
+        """
+        now = time.time()
+        blobs = []
+        expired = 0
+
+        for path in self.directory.glob("??/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            if path.name.startswith("."):
+                # Leftovers of interrupted writes
+                if now - stat.st_mtime > 3600:
+                    path.unlink(missing_ok=True)
+            elif now - stat.st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                expired += 1
+            else:
+                blobs.append((stat.st_mtime, stat.st_size, path))
+
+        self._size = sum(size for _, size, _ in blobs)
+        evicted = 0
+
+        for _, size, path in sorted(blobs):
+            if self._size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+            evicted += 1
+
+        self._last_sweep = now
+
+        if expired or evicted:
+            self.logger.info(
+                f"[BLOB STORE] Removed {expired} expired and {evicted} evicted blobs"
+            )
+
+
+_blob_store: BlobStore | None = None
+_blob_store_failed = False
+_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore | None:
+    """Get the process-wide blob store, creating it on first use.
+
+    Returns:
+        BlobStore | None: The blob store, or None if it is disabled
+            or its directory could not be created.
+    """
+    global _blob_store, _blob_store_failed
+
+    if settings.BLOB_STORE_DIR is None:
+        return None
+
+    with _lock:
+        if _blob_store is None and not _blob_store_failed:
+            try:
+                _blob_store = BlobStore(
+                    directory=settings.BLOB_STORE_DIR,
+                    max_size=settings.BLOB_STORE_MAX_SIZE,
+                    ttl=settings.BLOB_STORE_TTL,
+                )
+            except Exception:
+                logger.exception("[BLOB STORE] Error on blob store creation:")
+                _blob_store_failed = True
+        return _blob_store
@@ -1,2 +1,14 @@
 # Key for storing an empty chat page in the session state
 NEW_CHAT_KEY: str = "new_chat"
+
+# Key for storing the login success message shown after the post-login rerun
+LOGIN_MESSAGE_KEY: str = "login_message"
+
+# Key for storing when the login started, to measure the time to first screen
+LOGIN_STARTED_AT_KEY: str = "login_started_at"
+
+# Key for storing the id of the last rendered chat page, to detect when a page is reopened
+CURRENT_PAGE_KEY: str = "current_page"
+
+# Key for storing the messages prefetcher of the session
+PREFETCHER_KEY: str = "prefetcher"
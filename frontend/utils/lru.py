@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable, Iterator
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+D = TypeVar("D")
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe LRU cache, with named counters reported along with its size.
+
+    Each operation holds the lock on its own, so values must be safe to share
+    between threads once they are cached.
+
+    Args:
+        maxsize (int): Maximum number of entries kept in the cache.
+        counters (Iterable[str], optional): Names of the counters kept for `stats`.
+            Defaults to `("hits", "misses")`.
+    """
+
+    def __init__(self, maxsize: int, counters: Iterable[str] = ("hits", "misses")):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._counters: dict[str, float] = dict.fromkeys(counters, 0)
+        self._lock = threading.Lock()
+
+    def get(self, key: K, default: D = None) -> V | D:
+        """Get a value, marking it as the most recently used.
+
+        Args:
+            key (K): The key.
+            default (D, optional): Returned if the key is not cached. Defaults to None.
+
+        Returns:
+            V | D: The cached value, or the default.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def peek(self, key: K, default: D = None) -> V | D:
+        """Get a value, without marking it as used.
+
+        Args:
+            key (K): The key.
+            default (D, optional): Returned if the key is not cached. Defaults to None.
+
+        Returns:
+            V | D: The cached value, or the default.
+        """
+        with self._lock:
+            return self._entries.get(key, default)
+
+    def put(self, key: K, value: V, replace: bool = True) -> V:
+        """Cache a value, evicting the least recently used entries if needed.
+
+        Args:
+            key (K): The key.
+            value (V): The value.
+            replace (bool, optional): Whether a value already cached under the key,
+                e.g. by another thread, is replaced. Defaults to True.
+
+        Returns:
+            V: The cached value, which is the existing one if it was not replaced.
+        """
+        with self._lock:
+            if replace or key not in self._entries:
+                self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+            return self._entries[key]
+
+    def pop(self, key: K):
+        """Remove a value, if it is cached.
+
+        Args:
+            key (K): The key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def count(self, counter: str, amount: float = 1):
+        """Increment one of the counters.
+
+        Args:
+            counter (str): The counter name.
+            amount (float, optional): The increment. Defaults to 1.
+        """
+        with self._lock:
+            self._counters[counter] += amount
+
+    def stats(self) -> dict[str, float]:
+        """Get the counters and the current size of the cache.
+
+        Returns:
+            dict[str, float]: The cache statistics.
+        """
+        with self._lock:
+            return {**self._counters, "size": len(self._entries)}
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            for counter in self._counters:
+                self._counters[counter] = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __iter__(self) -> Iterator[K]:
+        with self._lock:
+            return iter(list(self._entries))
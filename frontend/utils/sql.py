@@ -0,0 +1,136 @@
+import hashlib
+import re
+import time
+
+import sqlparse
+from loguru import logger
+
+from frontend.settings import settings
+from frontend.utils.lru import LRUCache
+
+# Keywords that start a new line in the lightweight formatter
+_CLAUSE_KEYWORDS = (
+    r"SELECT|FROM|WHERE|GROUP\s+BY|ORDER\s+BY|HAVING|LIMIT|OFFSET|QUALIFY|WINDOW|"
+    r"UNION(?:\s+ALL|\s+DISTINCT)?|INTERSECT|EXCEPT|WITH|"
+    r"(?:(?:INNER|CROSS|(?:LEFT|RIGHT|FULL)(?:\s+OUTER)?)\s+)?JOIN"
+)
+
+# Keywords that are only uppercased in the lightweight formatter
+_OTHER_KEYWORDS = (
+    r"AND|OR|NOT|IN|IS|NULL|AS|ON|USING|DISTINCT|CASE|WHEN|THEN|ELSE|END|"
+    r"BETWEEN|LIKE|OVER|PARTITION\s+BY|ASC|DESC|CAST|EXISTS"
+)
+
+# String literals, quoted identifiers and comments are matched first, so keywords
+# inside them are left untouched
+_LIGHT_PATTERN = re.compile(
+    r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`|--[^\n]*|/\*[\s\S]*?\*/)"""
+    rf"|\s*\b({_CLAUSE_KEYWORDS})\b"
+    rf"|\b({_OTHER_KEYWORDS})\b",
+    re.IGNORECASE,
+)
+
+
+def _format_light(query: str) -> str:
+    """Format a SQL query with a single regex pass.
+
+    Main clauses are moved to their own lines and keywords are uppercased.
+    It is much faster than `sqlparse`, though the result is not reindented.
+
+    Args:
+        query (str): The SQL query.
+
+    Returns:
+        str: The formatted query.
+    """
+
+    def repl(match: re.Match) -> str:
+        if match.group(1):
+            return match.group(1)
+        elif match.group(2):
+            keyword = " ".join(match.group(2).upper().split())
+            return keyword if match.start() == 0 else "\n" + keyword
+        else:
+            return " ".join(match.group(3).upper().split())
+
+    return _LIGHT_PATTERN.sub(repl, query)
+
+
+class SQLFormatter:
+    """Thread-safe formatter of SQL queries, with an LRU cache of the results.
+
+    Queries are formatted with `sqlparse`, which is pure Python and slow on long
+    queries, so results are cached by a hash of the query. Queries longer than
+    `max_query_size` characters are formatted with a lightweight formatter instead.
+    The time spent formatting is accumulated in the statistics.
+
+    Args:
+        maxsize (int): Maximum number of formatted queries cached.
+        max_query_size (int): Maximum length of the queries formatted with `sqlparse`.
+    """
+
+    def __init__(self, maxsize: int, max_query_size: int):
+        self.max_query_size = max_query_size
+        self.logger = logger.bind(classname=self.__class__.__name__)
+        self._cache: LRUCache[bytes, str] = LRUCache(
+            maxsize, counters=("hits", "misses", "light", "seconds")
+        )
+
+    def format(self, query: str) -> str:
+        """Format a SQL query, reindenting it and uppercasing its keywords.
+
+        Args:
+            query (str): The SQL query.
+
+        Returns:
+            str: The formatted query.
+        """
+        start = time.perf_counter()
+        key = hashlib.blake2b(query.encode(), digest_size=16).digest()
+
+        formatted = self._cache.get(key)
+
+        if formatted is not None:
+            self._cache.count("hits")
+        else:
+            light = len(query) > self.max_query_size
+
+            if light:
+                formatted = _format_light(query.strip())
+            else:
+                formatted = sqlparse.format(
+                    query.strip(), reindent=True, keyword_case="upper"
+                )
+
+            formatted = self._cache.put(key, formatted, replace=False)
+            self._cache.count("misses")
+            self._cache.count("light", light)
+
+        elapsed = time.perf_counter() - start
+        self._cache.count("seconds", elapsed)
+
+        if elapsed > 0.1:
+            self.logger.info(
+                f"[SQL FORMAT] Formatted query of {len(query)} characters in {elapsed:.4f}s"
+            )
+
+        return formatted
+
+    def stats(self) -> dict[str, float]:
+        """Get the cache hit/miss counters, the number of queries formatted with the
+        lightweight formatter, the total formatting time in seconds and the cache size.
+
+        Returns:
+            dict[str, float]: The formatter statistics.
+        """
+        return self._cache.stats()
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        self._cache.clear()
+
+
+sql_formatter = SQLFormatter(
+    maxsize=settings.SQL_FORMAT_CACHE_MAX_SIZE,
+    max_query_size=settings.SQL_FORMAT_MAX_QUERY_SIZE,
+)
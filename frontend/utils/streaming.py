@@ -0,0 +1,90 @@
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class _End:
+    """Marks the end of the source iterator, carrying the error that ended it, if any."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+
+
+def batch_items(
+    items: Iterator[T], interval: float, is_urgent: Callable[[T], bool]
+) -> Iterator[list[T]]:
+    """Group the items of a blocking iterator into batches emitted at a bounded rate.
+
+    The source iterator is consumed on a separate thread, so a batch is emitted as soon
+    as `interval` seconds have passed since the previous one, even if no other item
+    arrives in the meantime. Urgent items flush the current batch right away.
+
+    Args:
+        items (Iterator[T]): The source iterator. It is consumed outside of the calling
+            thread, so it must not depend on thread-local state, e.g. `st.session_state`.
+        interval (float): Minimum time between two batches, in seconds.
+        is_urgent (Callable[[T], bool]): Whether an item must be emitted immediately.
+
+    Raises:
+        Exception: Any error raised by the source iterator, after the items
+            received before it are emitted.
+
+    Yields:
+        Iterator[list[T]]: The non-empty batches of items, in order.
+    """
+    pending: queue.SimpleQueue = queue.SimpleQueue()
+    stop = threading.Event()
+
+    def pump():
+        error = None
+        try:
+            for item in items:
+                if stop.is_set():
+                    break
+                pending.put(item)
+        except Exception as e:
+            error = e
+        finally:
+            if close := getattr(items, "close", None):
+                close()
+            pending.put(_End(error))
+
+    threading.Thread(target=pump, name="stream-pump", daemon=True).start()
+
+    batch: list[T] = []
+    last_flush = float("-inf")
+
+    try:
+        while True:
+            timeout = (
+                max(last_flush + interval - time.monotonic(), 0) if batch else None
+            )
+
+            try:
+                item = pending.get(timeout=timeout)
+            except queue.Empty:
+                yield batch
+                batch, last_flush = [], time.monotonic()
+                continue
+
+            if isinstance(item, _End):
+                if batch:
+                    yield batch
+                if item.error is not None:
+                    raise item.error
+                return
+
+            batch.append(item)
+
+            if is_urgent(item) or time.monotonic() - last_flush >= interval:
+                yield batch
+                batch, last_flush = [], time.monotonic()
+    finally:
+        # Stop consuming the source if the caller stops early, e.g. on a rerun
+        stop.set()
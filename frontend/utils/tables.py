@@ -0,0 +1,190 @@
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from frontend.datatypes.datatypes import ToolOutput
+from frontend.datatypes.history import output_digest, restore_output
+from frontend.settings import settings
+from frontend.utils.lru import LRUCache
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Tells apart outputs that are not cached from the ones cached as not tabular
+_MISSING = object()
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _get_rows(payload: Any) -> list[dict[str, Any]] | None:
+    """Get the rows of a tabular payload.
+
+    A payload is tabular if it is a non-empty list of objects, or an object
+    with a `columns` list and a `rows` or `data` list of lists.
+
+    Args:
+        payload (Any): The decoded payload.
+
+    Returns:
+        list[dict[str, Any]] | None: The rows, or None if the payload is not tabular.
+    """
+    if isinstance(payload, dict):
+        columns = payload.get("columns")
+        values = payload.get("rows", payload.get("data"))
+
+        if (
+            isinstance(columns, list)
+            and isinstance(values, list)
+            and all(isinstance(column, str) for column in columns)
+            and all(
+                isinstance(row, list) and len(row) == len(columns) for row in values
+            )
+        ):
+            return [dict(zip(columns, row)) for row in values]
+        return None
+
+    if (
+        isinstance(payload, list)
+        and payload
+        and all(isinstance(row, dict) for row in payload)
+    ):
+        return payload
+
+    return None
+
+
+def to_table(payload: Any) -> "pa.Table | None":
+    """Convert a tabular payload into an Arrow table.
+
+    Nested values are kept as JSON strings, so every column has a scalar type.
+
+    Args:
+        payload (Any): The decoded payload.
+
+    Returns:
+        pa.Table | None: The table, or None if the payload is not tabular
+            or its columns do not have consistent types.
+    """
+    rows = _get_rows(payload)
+
+    if rows is None:
+        return None
+
+    # pyarrow is only imported once a table is found, as it is slow to import
+    import pyarrow as pa
+
+    rows = [
+        {
+            key: value if _is_scalar(value) else json.dumps(value, ensure_ascii=False)
+            for key, value in row.items()
+        }
+        for row in rows
+    ]
+
+    try:
+        table = pa.Table.from_pylist(rows)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+
+    return table if table.num_columns > 0 else None
+
+
+def _hash_output(tool_output: ToolOutput) -> str:
+    """Hash the content and the artifact of a tool output."""
+    digest = hashlib.blake2b(output_digest(tool_output).encode(), digest_size=16)
+
+    if tool_output.artifact is not None:
+        digest.update(b"\0")
+        digest.update(
+            json.dumps(tool_output.artifact, sort_keys=True, ensure_ascii=False).encode(
+                "utf-8", "surrogatepass"
+            )
+        )
+
+    return digest.hexdigest()
+
+
+class OutputTables:
+    """Thread-safe LRU cache of the tables of tool outputs, keyed by tool call and content.
+
+    Tool outputs are checked once for a tabular payload, in their artifact or in
+    their content, which is then converted into an Arrow table. Outputs that are
+    not tabular are cached as well, so their content is not decoded again, and the
+    artifact is part of the key, as it may hold the table instead of the content.
+
+    Args:
+        maxsize (int): Maximum number of tool outputs cached.
+    """
+
+    def __init__(self, maxsize: int):
+        self.logger = logger.bind(classname=self.__class__.__name__)
+        self._cache: LRUCache[tuple[str, str], pa.Table | None] = LRUCache(maxsize)
+
+    def get(self, tool_output: ToolOutput) -> "pa.Table | None":
+        """Get the table of a tool output.
+
+        Args:
+            tool_output (ToolOutput): The tool output.
+
+        Returns:
+            pa.Table | None: The table, or None if the output is not tabular
+                or it was spilled and its content is not available anymore.
+        """
+        key = (tool_output.tool_call_id, _hash_output(tool_output))
+
+        if (table := self._cache.get(key, _MISSING)) is not _MISSING:
+            return table
+
+        # Not cached, so that the table is found once the content is available again
+        if (restored := restore_output(tool_output)) is None:
+            return None
+
+        return self._cache.put(key, self._convert(restored))
+
+    def _convert(self, tool_output: ToolOutput) -> "pa.Table | None":
+        try:
+            table = to_table(tool_output.artifact)
+
+            # Only contents that may hold a JSON array or object are decoded
+            if table is None and tool_output.content.lstrip()[:1] in ("[", "{"):
+                table = to_table(json.loads(tool_output.content))
+
+            return table
+        except ValueError:
+            return None
+        except Exception:
+            self.logger.exception(
+                f"[TABLES] Error on table conversion for tool call {tool_output.tool_call_id}:"
+            )
+            return None
+
+    def clear(self):
+        """Remove all entries."""
+        self._cache.clear()
+
+
+def table_artifact(tool_output: ToolOutput, table: "pa.Table") -> dict[str, Any]:
+    """Describe the table of a tool output as a message artifact.
+
+    Args:
+        tool_output (ToolOutput): The tool output.
+        table (pa.Table): Its table.
+
+    Returns:
+        dict[str, Any]: The artifact, with the tool call, the columns
+            and the number of rows of the table.
+    """
+    return {
+        "type": "table",
+        "tool_call_id": tool_output.tool_call_id,
+        "tool_name": tool_output.tool_name,
+        "columns": table.column_names,
+        "num_rows": table.num_rows,
+    }
+
+
+output_tables = OutputTables(maxsize=settings.TOOL_OUTPUT_TABLE_CACHE_MAX_SIZE)
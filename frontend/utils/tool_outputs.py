@@ -0,0 +1,206 @@
+import json
+import threading
+
+from frontend.datatypes.datatypes import ToolOutput
+from frontend.datatypes.history import output_digest, restore_output
+from frontend.settings import settings
+from frontend.utils.lru import LRUCache
+
+_DECODER = json.JSONDecoder()
+
+_WHITESPACE = " \t\n\r"
+
+
+def _indent(text: str) -> str:
+    return "  " + text.replace("\n", "\n  ")
+
+
+class OutputPreview:
+    """Pretty-printed preview of a tool output, formatted one page at a time.
+
+    Outputs holding a JSON array, like query results, are decoded row by row, so
+    only the rows that are shown are ever parsed and formatted. A page ends after
+    `page_rows` rows or once it reaches `page_size` characters. Other outputs are
+    pretty-printed whole if they fit a page, or paged through as raw text.
+
+    Args:
+        content (str): The tool output.
+        page_rows (int): Maximum number of rows in a page.
+        page_size (int): Maximum number of characters in a page.
+    """
+
+    def __init__(self, content: str, page_rows: int, page_size: int):
+        self.content = content
+        self.page_rows = page_rows
+        self.page_size = page_size
+        self._pages: list[str] = []
+        self._rows = 0
+        self._lock = threading.Lock()
+
+        start = len(content) - len(content.lstrip(_WHITESPACE))
+        # Position of the next row to decode, or None if the output is not an array
+        self._position = start + 1 if content.startswith("[", start) else None
+        self._complete = False
+
+    @property
+    def rows(self) -> int | None:
+        """Number of rows decoded so far, or None if the output is not an array."""
+        return self._rows if self._position is not None else None
+
+    def render(self, pages: int) -> str:
+        """Get the formatted text of the first pages of the output.
+
+        Args:
+            pages (int): The number of pages.
+
+        Returns:
+            str: The formatted text, ending with an ellipsis if there are more pages.
+        """
+        with self._lock:
+            self._format(pages)
+            shown = self._pages[:pages]
+            more = self._has_more(pages)
+
+        if self._position is None:
+            text = "".join(shown)
+            return text + "\n..." if more else text
+
+        rows = ",\n".join(shown)
+
+        if more:
+            return f"[\n{rows},\n  ...\n]"
+
+        return f"[\n{rows}\n]" if rows else "[]"
+
+    def has_more(self, pages: int) -> bool:
+        """Check if the output has more than the given number of pages.
+
+        Args:
+            pages (int): The number of pages.
+
+        Returns:
+            bool: Whether there are more pages to show.
+        """
+        with self._lock:
+            self._format(pages)
+            return self._has_more(pages)
+
+    def _has_more(self, pages: int) -> bool:
+        return not self._complete or pages < len(self._pages)
+
+    def _format(self, pages: int):
+        while len(self._pages) < pages and not self._complete:
+            self._pages.append(self._next_page())
+
+    def _next_page(self) -> str:
+        if self._position is None:
+            return self._next_text_page()
+
+        content = self.content
+        rows = []
+        size = 0
+
+        try:
+            while (
+                not self._complete
+                and len(rows) < self.page_rows
+                and size < self.page_size
+            ):
+                position = self._skip(self._position)
+
+                if content.startswith("]", position):
+                    self._complete = True
+                    break
+
+                row, end = _DECODER.raw_decode(content, position)
+                text = json.dumps(row, ensure_ascii=False, indent=2)
+
+                # A single row larger than a page is clipped
+                if len(text) > self.page_size:
+                    text = text[: self.page_size] + "\n..."
+
+                rows.append(_indent(text))
+                size += len(text)
+                self._rows += 1
+
+                position = self._skip(end)
+                self._position = position + content.startswith(",", position)
+
+                if position == len(content) or content.startswith("]", position):
+                    self._complete = True
+        except ValueError:
+            # The output is not valid JSON, so the rest of it is shown as is
+            rows.append(content[self._position :][: self.page_size])
+            self._complete = True
+
+        return ",\n".join(rows)
+
+    def _next_text_page(self) -> str:
+        content = self.content
+
+        if not self._pages and len(content) <= self.page_size:
+            self._complete = True
+            try:
+                return json.dumps(json.loads(content), ensure_ascii=False, indent=2)
+            except ValueError:
+                return content
+
+        start = len(self._pages) * self.page_size
+        end = start + self.page_size
+        self._complete = end >= len(content)
+
+        return content[start:end]
+
+    def _skip(self, position: int) -> int:
+        content = self.content
+        while position < len(content) and content[position] in _WHITESPACE:
+            position += 1
+        return position
+
+
+class OutputPreviews:
+    """Thread-safe LRU cache of tool output previews, keyed by tool call and content.
+
+    Previews keep the pages formatted so far, so paging through an output only
+    formats the new page. A spilled output shares the preview of its full content.
+
+    Args:
+        maxsize (int): Maximum number of previews cached.
+    """
+
+    def __init__(self, maxsize: int):
+        self._cache: LRUCache[tuple[str, str], OutputPreview] = LRUCache(maxsize)
+
+    def get(self, tool_output: ToolOutput) -> OutputPreview | None:
+        """Get the preview of a tool output, creating it if needed.
+
+        Args:
+            tool_output (ToolOutput): The tool output.
+
+        Returns:
+            OutputPreview | None: The preview, or None if the output was spilled
+                and its content is not available anymore.
+        """
+        key = (tool_output.tool_call_id, output_digest(tool_output))
+
+        if (preview := self._cache.get(key)) is not None:
+            return preview
+
+        if (restored := restore_output(tool_output)) is None:
+            return None
+
+        preview = OutputPreview(
+            restored.content,
+            page_rows=settings.TOOL_OUTPUT_PAGE_ROWS,
+            page_size=settings.TOOL_OUTPUT_PAGE_SIZE,
+        )
+
+        # Another thread may have created the preview in the meantime
+        return self._cache.put(key, preview, replace=False)
+
+    def clear(self):
+        """Remove all entries."""
+        self._cache.clear()
+
+
+output_previews = OutputPreviews(maxsize=settings.TOOL_OUTPUT_PREVIEW_CACHE_MAX_SIZE)
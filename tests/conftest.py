@@ -0,0 +1,73 @@
+import time
+import uuid
+from collections.abc import Callable
+
+import httpx
+import jwt
+import pytest
+
+from frontend.api import APIClient, AsyncAPIClient, InMemoryTokenStore
+
+WEBSITE_URL = "http://website.test"
+CHATBOT_URL = "http://chatbot.test"
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+def _make_token() -> str:
+    now = time.time()
+    payload = {"username": uuid.uuid4().hex, "iat": int(now), "exp": int(now) + 3600}
+    return jwt.encode(payload, "stand-in-secret-" + "x" * 32, algorithm="HS256")
+
+
+@pytest.fixture
+def make_token() -> Callable[[], str]:
+    """Factory of access tokens valid for an hour, for a new user each time."""
+    return _make_token
+
+
+@pytest.fixture
+def access_token() -> str:
+    """An access token valid for an hour."""
+    return _make_token()
+
+
+@pytest.fixture
+def make_client() -> Callable[[Handler], APIClient]:
+    """Factory of API clients whose requests are answered by a stand-in handler."""
+    clients = []
+
+    def factory(handler: Handler) -> APIClient:
+        client = APIClient(
+            base_website_url=WEBSITE_URL,
+            base_chatbot_url=CHATBOT_URL,
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+            token_store=InMemoryTokenStore(),
+        )
+        clients.append(client)
+        return client
+
+    yield factory
+
+    for client in clients:
+        client.http_client.close()
+
+
+@pytest.fixture
+def make_async_client() -> Callable[[Handler], AsyncAPIClient]:
+    """Async counterpart of `make_client`. Clients must be closed by the tests."""
+
+    def factory(handler: Handler) -> AsyncAPIClient:
+        return AsyncAPIClient(
+            base_website_url=WEBSITE_URL,
+            base_chatbot_url=CHATBOT_URL,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            token_store=InMemoryTokenStore(),
+        )
+
+    return factory
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
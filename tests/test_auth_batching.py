@@ -0,0 +1,164 @@
+import json
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from frontend.api.base import (
+    ACCESS_FORBIDDEN_MESSAGE,
+    LOGIN_SUCCESS_MESSAGE,
+    BaseAPIClient,
+)
+from frontend.exceptions import AccessForbiddenException
+from frontend.settings import settings
+
+
+class GraphQLStandIn:
+    """Stand-in for the website GraphQL API, with or without batched token mutations.
+
+    Args:
+        make_token (Callable[[], str]): Factory of the issued tokens.
+        batching (bool): Whether the token mutations can select the token payload.
+        has_chatbot_access (bool): The chatbot access claim of issued tokens.
+    """
+
+    def __init__(
+        self,
+        make_token: Callable[[], str],
+        batching: bool,
+        has_chatbot_access: bool = True,
+    ):
+        self.make_token = make_token
+        self.batching = batching
+        self.has_chatbot_access = has_chatbot_access
+        self.operations: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        query = json.loads(request.content)["query"]
+        field = next(
+            name
+            for name in ("tokenAuth", "refreshToken", "verifyToken")
+            if name in query
+        )
+        batched = field != "verifyToken" and "payload" in query
+        self.operations.append(f"{field}+payload" if batched else field)
+
+        payload = {"has_chatbot_access": self.has_chatbot_access}
+
+        if field == "verifyToken":
+            return httpx.Response(200, json={"data": {field: {"payload": payload}}})
+
+        # graphene-django answers schema validation errors with a 400
+        if batched and not self.batching:
+            return httpx.Response(
+                400,
+                json={
+                    "errors": [
+                        {
+                            "message": 'Cannot query field "payload" on type '
+                            '"ObtainJSONWebToken".'
+                        }
+                    ]
+                },
+            )
+
+        result = {"token": self.make_token()}
+
+        if batched:
+            result["payload"] = payload
+
+        return httpx.Response(200, json={"data": {field: result}})
+
+
+@pytest.fixture(autouse=True)
+def _setup(monkeypatch):
+    monkeypatch.setattr(BaseAPIClient, "_auth_batching_supported", True)
+    monkeypatch.setattr(settings, "JWT_PUBLIC_KEY", None)
+    monkeypatch.setattr(settings, "JWT_SECRET_KEY", None)
+
+
+def test_login_batched(make_token, make_client):
+    server = GraphQLStandIn(make_token, batching=True)
+
+    result = make_client(server).login("user@test", "password", fetch_threads=False)
+
+    assert result.access_token is not None
+    assert result.message == LOGIN_SUCCESS_MESSAGE
+    assert server.operations == ["tokenAuth+payload"]
+
+
+def test_login_falls_back_when_batching_is_unsupported(make_token, make_client):
+    server = GraphQLStandIn(make_token, batching=False)
+    client = make_client(server)
+
+    result = client.login("user@test", "password", fetch_threads=False)
+
+    assert result.access_token is not None
+    assert result.message == LOGIN_SUCCESS_MESSAGE
+    assert server.operations == ["tokenAuth+payload", "tokenAuth", "verifyToken"]
+    assert BaseAPIClient._auth_batching_supported is False
+
+    # Batching stays off, so the following logins skip the rejected attempt
+    server.operations.clear()
+    client.login("user@test", "password", fetch_threads=False)
+
+    assert server.operations == ["tokenAuth", "verifyToken"]
+
+
+@pytest.mark.parametrize("batching", [True, False])
+def test_login_access_forbidden(batching, make_token, make_client):
+    server = GraphQLStandIn(make_token, batching=batching, has_chatbot_access=False)
+
+    result = make_client(server).login("user@test", "password", fetch_threads=False)
+
+    assert result.access_token is None
+    assert result.message == ACCESS_FORBIDDEN_MESSAGE
+
+
+def test_refresh_and_verify_batched(make_token, make_client):
+    server = GraphQLStandIn(make_token, batching=True)
+    token = make_token()
+
+    refreshed_token = make_client(server)._refresh_and_verify(token)
+
+    assert refreshed_token != token
+    assert server.operations == ["refreshToken+payload"]
+
+
+def test_refresh_and_verify_falls_back_when_batching_is_unsupported(
+    make_token, make_client
+):
+    server = GraphQLStandIn(make_token, batching=False)
+    token = make_token()
+
+    refreshed_token = make_client(server)._refresh_and_verify(token)
+
+    assert refreshed_token != token
+    assert server.operations == [
+        "refreshToken+payload",
+        "refreshToken",
+        "verifyToken",
+    ]
+
+
+@pytest.mark.parametrize("batching", [True, False])
+def test_refresh_and_verify_access_forbidden(batching, make_token, make_client):
+    server = GraphQLStandIn(make_token, batching=batching, has_chatbot_access=False)
+
+    with pytest.raises(AccessForbiddenException):
+        make_client(server)._refresh_and_verify(make_token())
+
+
+@pytest.mark.anyio
+async def test_async_login_falls_back_when_batching_is_unsupported(
+    make_token, make_async_client
+):
+    server = GraphQLStandIn(make_token, batching=False)
+    client = make_async_client(server)
+
+    result = await client.login("user@test", "password", fetch_threads=False)
+
+    assert result.access_token is not None
+    assert server.operations == ["tokenAuth+payload", "tokenAuth", "verifyToken"]
+
+    await client.aclose()
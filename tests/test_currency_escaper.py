@@ -0,0 +1,75 @@
+import random
+import re
+
+import pytest
+
+from frontend.datatypes import CurrencyEscaper, escape_currency
+
+# Dollar sign escaping as it was done with a regex substitution, before
+# `escape_currency` and `CurrencyEscaper` scanned the text themselves
+REFERENCE_PATTERN = re.compile(
+    r"(\$\$[\s\S]*?\$\$)|(\$(?!\$)(?!\s)[^\$\n]*?[^\$\s]\$)|(\$)"
+)
+
+# Fragments that make dollar signs ambiguous: math blocks, inline math,
+# spaces and newlines around them, and other whitespace characters
+ALPHABET = ["$", "$", "$$", "a", "1", " ", "\n", "\t", "x^2", " ", "\x1c", "\\"]
+
+EXAMPLES = 10000
+
+
+def _reference_escape(text: str) -> str:
+    return REFERENCE_PATTERN.sub(
+        lambda match: match.group(1) or match.group(2) or r"\$", text
+    )
+
+
+def _random_texts(seed: int):
+    rng = random.Random(seed)
+    for _ in range(EXAMPLES):
+        size = rng.randint(0, 30)
+        yield rng, "".join(rng.choice(ALPHABET) for _ in range(size))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "$",
+        "custa $5",
+        "de $3 a $5",
+        "$x^2$",
+        "$ x$",
+        "$x $",
+        "$$x^2 + y$$",
+        "$$ sem fim",
+        "$a\nb$",
+        "$$$",
+    ],
+)
+def test_escape_currency_examples(text):
+    assert escape_currency(text) == _reference_escape(text)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_escape_currency_matches_reference(seed):
+    for _, text in _random_texts(seed):
+        assert escape_currency(text) == _reference_escape(text), text
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_currency_escaper_matches_escape_currency(seed):
+    for rng, text in _random_texts(seed):
+        escaper = CurrencyEscaper()
+        output = []
+        position = 0
+
+        # Chunks may be empty or split math blocks and escaped dollar signs
+        while position < len(text):
+            size = rng.randint(0, 6)
+            output.append(escaper.feed(text[position : position + size]))
+            position += size
+
+        output.append(escaper.flush())
+
+        assert "".join(output) == escape_currency(text), (text, output)
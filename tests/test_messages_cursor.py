@@ -0,0 +1,107 @@
+import uuid
+
+import httpx
+import pytest
+
+from frontend.api.base import BaseAPIClient
+
+AFTER_ERROR = {
+    "detail": [
+        {
+            "type": "extra_forbidden",
+            "loc": ["query", "after"],
+            "msg": "Extra inputs are not permitted",
+        }
+    ]
+}
+
+THREAD_ID_ERROR = {
+    "detail": [
+        {
+            "type": "uuid_parsing",
+            "loc": ["path", "thread_id"],
+            "msg": "Input should be a valid UUID",
+        }
+    ]
+}
+
+
+def _make_message() -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "role": "USER",
+        "content": "pergunta",
+        "status": "SUCCESS",
+    }
+
+
+class MessagesStandIn:
+    """Stand-in for the chatbot messages endpoint, failing requests with a cursor.
+
+    Args:
+        status_code (int): Status code of the responses to requests with a cursor.
+        error (dict | str): Body of the responses to requests with a cursor.
+    """
+
+    def __init__(self, status_code: int, error: dict | str):
+        self.status_code = status_code
+        self.error = error
+        self.cursors: list[str | None] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        after = request.url.params.get("after")
+        self.cursors.append(after)
+
+        if after is not None:
+            if isinstance(self.error, dict):
+                return httpx.Response(self.status_code, json=self.error)
+            return httpx.Response(self.status_code, text=self.error)
+
+        return httpx.Response(200, json=[_make_message()])
+
+
+@pytest.fixture(autouse=True)
+def _setup(monkeypatch):
+    monkeypatch.setattr(BaseAPIClient, "_messages_cursor_supported", True)
+
+
+@pytest.mark.parametrize(
+    "status_code, error",
+    [
+        (422, AFTER_ERROR),
+        (400, {"detail": "Unknown query parameter: after"}),
+        (400, "unexpected parameter 'after'"),
+    ],
+)
+def test_cursor_rejection_falls_back_to_full_fetch(
+    status_code, error, access_token, make_client
+):
+    server = MessagesStandIn(status_code, error)
+    after = uuid.uuid4()
+
+    messages = make_client(server).get_messages(access_token, uuid.uuid4(), after=after)
+
+    assert messages is not None and len(messages) == 1
+    assert server.cursors == [str(after), None]
+    assert BaseAPIClient._messages_cursor_supported is False
+
+
+@pytest.mark.parametrize(
+    "status_code, error",
+    [
+        (422, THREAD_ID_ERROR),
+        (400, {"detail": "Thread is archived"}),
+        (400, "Bad Request"),
+    ],
+)
+def test_other_client_errors_keep_the_cursor(
+    status_code, error, access_token, make_client
+):
+    server = MessagesStandIn(status_code, error)
+    after = uuid.uuid4()
+
+    messages = make_client(server).get_messages(access_token, uuid.uuid4(), after=after)
+
+    assert messages is None
+    assert server.cursors == [str(after)]
+    assert BaseAPIClient._messages_cursor_supported is True
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+
+import httpx
+import pytest
+
+from frontend.api.ndjson import _LineSplitter, iter_stream_events
+
+# Time the stand-in stream waits after its first event, unless it is released
+HOLD_TIMEOUT = 5
+
+
+def _event_line(event_type: str, data: dict) -> bytes:
+    return json.dumps({"type": event_type, "data": data}).encode() + b"\n"
+
+
+FIRST_EVENT = _event_line("tool_call", {"content": "thinking", "tool_calls": []})
+LAST_EVENTS = _event_line("final_answer", {"content": "answer"}) + _event_line(
+    "complete", {"run_id": str(uuid.uuid4())}
+)
+
+
+class HeldStream(httpx.SyncByteStream):
+    """Response stream that sends its first event, then holds the rest back."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def __iter__(self):
+        yield FIRST_EVENT
+        self.release.wait(HOLD_TIMEOUT)
+        yield LAST_EVENTS
+
+
+class AsyncHeldStream(httpx.AsyncByteStream):
+    """Async counterpart of `HeldStream`."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def __aiter__(self):
+        yield FIRST_EVENT
+        try:
+            await asyncio.wait_for(self.release.wait(), HOLD_TIMEOUT)
+        except TimeoutError:
+            pass
+        yield LAST_EVENTS
+
+
+def test_line_splitter_joins_lines_across_chunks():
+    payload = FIRST_EVENT + b"\n" + LAST_EVENTS
+    chunks = [payload[i : i + 7] for i in range(0, len(payload), 7)]
+
+    events = list(iter_stream_events(chunks))
+
+    assert [event.type for event in events] == ["tool_call", "final_answer", "complete"]
+
+
+def test_line_splitter_flushes_last_line_without_newline():
+    splitter = _LineSplitter()
+
+    assert list(splitter.feed(b'{"a": 1}\n{"b"')) == [b'{"a": 1}']
+    assert list(splitter.feed(b": 2}")) == []
+    assert list(splitter.flush()) == [b'{"b": 2}']
+
+
+def test_send_message_yields_events_as_they_arrive(access_token, make_client):
+    stream = HeldStream()
+    client = make_client(lambda request: httpx.Response(200, stream=stream))
+
+    events = client.send_message(access_token, "message", uuid.uuid4())
+
+    start = time.perf_counter()
+    first_event = next(events)
+
+    # The first event is not held back until the rest of the stream arrives
+    assert first_event.type == "tool_call"
+    assert time.perf_counter() - start < HOLD_TIMEOUT / 2
+
+    stream.release.set()
+    assert [event.type for event in events] == ["final_answer", "complete"]
+
+
+@pytest.mark.anyio
+async def test_async_send_message_yields_events_as_they_arrive(
+    access_token, make_async_client
+):
+    stream = AsyncHeldStream()
+    client = make_async_client(lambda request: httpx.Response(200, stream=stream))
+
+    events = client.send_message(access_token, "message", uuid.uuid4())
+
+    start = time.perf_counter()
+    first_event = await anext(events)
+
+    assert first_event.type == "tool_call"
+    assert time.perf_counter() - start < HOLD_TIMEOUT / 2
+
+    stream.release.set()
+    assert [event.type async for event in events] == ["final_answer", "complete"]
+
+    await client.aclose()
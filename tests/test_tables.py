@@ -0,0 +1,41 @@
+from frontend.datatypes.datatypes import ToolOutput
+from frontend.utils.tables import OutputTables
+
+
+def _make_output(content: str, artifact=None) -> ToolOutput:
+    return ToolOutput(
+        status="success",
+        tool_call_id="call_1",
+        tool_name="execute_bigquery_sql",
+        output=content,
+        artifact=artifact,
+    )
+
+
+def test_tables_are_not_shared_across_outputs():
+    tables = OutputTables(maxsize=8)
+
+    # Same tool call id and same length, e.g. outputs of two users' threads
+    first = tables.get(_make_output('[{"user": "a"}]'))
+    second = tables.get(_make_output('[{"user": "b"}]'))
+
+    assert first.to_pylist() == [{"user": "a"}]
+    assert second.to_pylist() == [{"user": "b"}]
+    assert tables.get(_make_output('[{"user": "a"}]')) is first
+
+
+def test_tables_are_keyed_by_artifact():
+    tables = OutputTables(maxsize=8)
+
+    first = tables.get(_make_output("", artifact=[{"user": "a"}]))
+    second = tables.get(_make_output("", artifact=[{"user": "b"}]))
+
+    assert first.to_pylist() == [{"user": "a"}]
+    assert second.to_pylist() == [{"user": "b"}]
+
+
+def test_non_tabular_outputs_are_cached():
+    tables = OutputTables(maxsize=8)
+
+    assert tables.get(_make_output("not a table")) is None
+    assert len(tables._cache) == 1
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import jwt
+
+from frontend.api.token_manager import TokenManager
+
+
+def _make_token(lifetime: float, age: float = 0, with_iat: bool = True) -> str:
+    now = time.time()
+    payload = {"username": f"user-{now}-{age}", "exp": int(now - age + lifetime)}
+    if with_iat:
+        payload["iat"] = int(now - age)
+    return jwt.encode(payload, "test-secret-" + "x" * 32, algorithm="HS256")
+
+
+class _CountingRefresh:
+    def __init__(self, lifetime: float):
+        self.lifetime = lifetime
+        self.calls = 0
+        self.done = threading.Event()
+
+    def __call__(self, token: str) -> str:
+        self.calls += 1
+        self.done.set()
+        return _make_token(self.lifetime)
+
+
+def _wait_background(manager: TokenManager):
+    if manager._executor is not None:
+        manager._executor.shutdown(wait=True)
+        manager._executor = None
+
+
+def test_fresh_short_lived_token_is_not_refreshed():
+    manager = TokenManager(refresh_ahead=300, max_workers=2, max_successors=16)
+    refresh = _CountingRefresh(lifetime=300)
+
+    for with_iat in (True, False):
+        token = _make_token(lifetime=300, with_iat=with_iat)
+        for _ in range(10):
+            assert manager.get_token(token, refresh) == token
+
+    _wait_background(manager)
+    assert refresh.calls == 0
+
+
+def test_token_in_last_fifth_of_lifetime_is_refreshed_in_background():
+    manager = TokenManager(refresh_ahead=300, max_workers=2, max_successors=16)
+    refresh = _CountingRefresh(lifetime=300)
+    token = _make_token(lifetime=300, age=250)
+
+    # The caller is not kept waiting, and later calls get the refreshed token
+    assert manager.get_token(token, refresh) == token
+    for _ in range(9):
+        manager.get_token(token, refresh)
+
+    _wait_background(manager)
+    assert refresh.calls == 1
+    assert manager.get_token(token, refresh) != token
+
+
+def test_long_lived_token_window_is_capped():
+    manager = TokenManager(refresh_ahead=300, max_workers=2, max_successors=16)
+    refresh = _CountingRefresh(lifetime=3600)
+
+    # 20% of the lifetime would be 720s before expiring, but the cap is 300s
+    manager.get_token(_make_token(lifetime=3600, age=3000), refresh)
+    _wait_background(manager)
+    assert refresh.calls == 0
+
+    manager.get_token(_make_token(lifetime=3600, age=3400), refresh)
+    _wait_background(manager)
+    assert refresh.calls == 1
+
+
+def test_token_about_to_expire_waits_for_refresh():
+    manager = TokenManager(refresh_ahead=300, max_workers=2, max_successors=16)
+    refresh = _CountingRefresh(lifetime=300)
+    token = _make_token(lifetime=300, age=290)
+
+    assert manager.get_token(token, refresh) != token
+    assert refresh.calls == 1
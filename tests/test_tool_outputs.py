@@ -0,0 +1,97 @@
+import pytest
+
+from frontend.datatypes import history
+from frontend.datatypes.datatypes import ToolOutput
+from frontend.utils.blob_store import BlobStore
+from frontend.utils.tool_outputs import OutputPreviews
+
+
+def _make_output(content: str, tool_call_id: str = "call_1", **kwargs) -> ToolOutput:
+    return ToolOutput(
+        status="success",
+        tool_call_id=tool_call_id,
+        tool_name="execute_bigquery_sql",
+        output=content,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def blob_store(tmp_path, monkeypatch):
+    store = BlobStore(tmp_path, max_size=1024 * 1024, ttl=3600)
+    monkeypatch.setattr(history, "get_blob_store", lambda: store)
+    return store
+
+
+def _spill(store: BlobStore, content: str) -> ToolOutput:
+    key = store.put(content.encode())
+    return _make_output(
+        content[:10], metadata={"blob": {"key": key, "size": len(content)}}
+    )
+
+
+def _delete_blobs(store: BlobStore):
+    for path in store.directory.glob("??/*"):
+        path.unlink()
+
+
+def test_previews_are_not_shared_across_contents():
+    previews = OutputPreviews(maxsize=8)
+
+    # Same tool call id and same length, e.g. outputs of two users' threads
+    first = previews.get(_make_output('[{"user": "a"}]'))
+    second = previews.get(_make_output('[{"user": "b"}]'))
+
+    assert first is not second
+    assert '"b"' in second.render(1)
+    assert previews.get(_make_output('[{"user": "a"}]')) is first
+
+
+def test_previews_are_evicted_least_recently_used_first():
+    previews = OutputPreviews(maxsize=2)
+
+    first = previews.get(_make_output("[1]", "call_1"))
+    previews.get(_make_output("[2]", "call_2"))
+    previews.get(_make_output("[1]", "call_1"))
+    previews.get(_make_output("[3]", "call_3"))
+
+    assert previews.get(_make_output("[1]", "call_1")) is first
+    assert len(previews._cache) == 2
+    assert "call_2" not in {key[0] for key in previews._cache}
+
+
+def test_spilled_outputs_share_the_preview_of_their_content(blob_store):
+    previews = OutputPreviews(maxsize=8)
+    content = '[{"user": "a"}, {"user": "b"}]'
+
+    preview = previews.get(_make_output(content))
+
+    assert previews.get(_spill(blob_store, content)) is preview
+
+
+def test_spilled_outputs_are_only_restored_on_a_miss(blob_store):
+    previews = OutputPreviews(maxsize=8)
+    content = '[{"user": "a"}, {"user": "b"}]'
+    spilled = _spill(blob_store, content)
+
+    preview = previews.get(spilled)
+    assert preview.content == content
+
+    # The blob is not read again once the preview is cached
+    _delete_blobs(blob_store)
+    assert previews.get(spilled) is preview
+
+
+def test_lost_spilled_outputs_are_not_cached(blob_store):
+    previews = OutputPreviews(maxsize=8)
+    content = '[{"user": "a"}, {"user": "b"}]'
+    spilled = _spill(blob_store, content)
+
+    _delete_blobs(blob_store)
+
+    assert previews.get(spilled) is None
+    assert len(previews._cache) == 0
+
+    # Spilling the same content again makes it available under the same key
+    blob_store.put(content.encode())
+    assert previews.get(spilled).content == content